@@ -9,12 +9,77 @@ from typing import Dict, List, Optional
 SUITS = ["C", "D", "H", "S"]  # Clubs, Diamonds, Hearts, Spades
 RANKS = ["2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A"]
 
+# ------------------------------------------------------------
+# Cactus-Kev-style integer cards.
+#
+# Eine Karte ist ein einzelner int statt eines Strings wie "10H":
+#
+#   +--------+--------+--------+--------+
+#   |xxxbbbbb|bbbbbbbb|ssssrrrr|xxpppppp|
+#   +--------+--------+--------+--------+
+#
+#   p = Primzahl des Rangs (2,3,5,...,41)
+#   r = Rang-Index (0 = Deuce, 12 = Ass)
+#   s = Suit-Bit (C=0x8000, D=0x4000, H=0x2000, S=0x1000)
+#   b = Rang-Bitmaske (1 << rank_index), für Evaluatoren
+#
+# Strings wie "AS" gibt es nur noch an der Telegram-Grenze
+# (Dateinamen, Anzeigetexte) via card_code().
+# ------------------------------------------------------------
 
-def create_deck() -> List[str]:
+SUIT_BITS = {"C": 0x8000, "D": 0x4000, "H": 0x2000, "S": 0x1000}
+RANK_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+
+
+def _make_card(rank_idx: int, suit: str) -> int:
+    return (
+        (1 << (16 + rank_idx))
+        | SUIT_BITS[suit]
+        | (rank_idx << 8)
+        | RANK_PRIMES[rank_idx]
+    )
+
+
+# code ("AS") <-> card (int) in beide Richtungen
+CODE_TO_CARD: Dict[str, int] = {
+    f"{RANKS[r]}{s}": _make_card(r, s) for s in SUITS for r in range(13)
+}
+CARD_TO_CODE: Dict[int, str] = {c: code for code, c in CODE_TO_CARD.items()}
+
+
+def card_code(card: int) -> str:
+    """Int-Karte -> String-Code wie "10H" (nur für UI/Dateinamen)."""
+    return CARD_TO_CODE[card]
+
+
+def card_rank(card: int) -> int:
+    """Rang als Wert 2..14 (Ass = 14)."""
+    return ((card >> 8) & 0xF) + 2
+
+
+def card_suit(card: int) -> int:
+    """Suit-Bit (0x8000/0x4000/0x2000/0x1000)."""
+    return card & 0xF000
+
+
+def card_prime(card: int) -> int:
+    """Primzahl des Rangs (für Lookup-Tabellen über Prim-Produkte)."""
+    return card & 0x3F
+
+
+# Deck-Vorlage einmal bauen; create_deck() kopiert nur noch.
+_DECK_TEMPLATE = tuple(CARD_TO_CODE)
+
+# Eigene RNG-Instanz statt des globalen random-Moduls: kein geteilter
+# Zustand mit anderem Code, und Methoden-Lookups bleiben lokal.
+_RNG = random.Random()
+
+
+def create_deck() -> List[int]:
     """Return a fresh shuffled 52-card deck (no jokers)."""
-    deck = [f"{rank}{suit}" for suit in SUITS for rank in RANKS]
-    random.shuffle(deck)
-    return deck
+    # sample(pop, 52) zieht direkt aus der Vorlage – Kopie + Shuffle
+    # in einem Rutsch, ohne Zwischenliste.
+    return _RNG.sample(_DECK_TEMPLATE, 52)
 
 
 class Stage(Enum):
@@ -26,15 +91,18 @@ class Stage(Enum):
     SHOWDOWN = auto()
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
     user_id: int
     name: str
     avatar_file_id: Optional[str] = None
     chips: int = 1000
     current_bet: int = 0
+    # Epoche, zu der current_bet gehört; weicht sie von Table.bet_epoch
+    # ab, gilt der Einsatz als 0 (lazy Reset pro Street)
+    bet_epoch: int = 0
     folded: bool = False
-    hole_cards: List[str] = field(default_factory=list)
+    hole_cards: List[int] = field(default_factory=list)
 
     # optionale Felder, die vom Bot-Code genutzt werden (AFK, etc.)
     last_action_time: Optional[float] = None
@@ -46,7 +114,7 @@ class Player:
         self.hole_cards.clear()
 
 
-@dataclass
+@dataclass(slots=True)
 class Table:
     chat_id: int
     thread_id: Optional[int]
@@ -62,8 +130,9 @@ class Table:
     max_players: int = 0   # 0 = unlimited seats
 
     players: Dict[int, Player] = field(default_factory=dict)
-    deck: List[str] = field(default_factory=list)
-    community_cards: List[str] = field(default_factory=list)
+    deck: List[int] = field(default_factory=list)
+    deck_idx: int = 0
+    community_cards: List[int] = field(default_factory=list)
     pot: int = 0
     stage: Stage = Stage.WAITING_FOR_PLAYERS
     dealer_index: int = 0
@@ -71,6 +140,38 @@ class Table:
     current_turn_idx: int = 0
     current_bet: int = 0
 
+    # Street-Zähler: statt bei jedem Flop/Turn/River alle current_bets
+    # in einer Schleife zu nullen, wird nur diese Epoche hochgezählt;
+    # Spieler-Einsätze werden beim nächsten Zugriff lazy genullt.
+    bet_epoch: int = 0
+
+    # Laufende Zähler, damit everyone_matched_or_folded() in O(1) geht
+    # statt pro Button-Klick Listen & Sets zu bauen:
+    # - n_active:  Spieler, die nicht gefoldet haben
+    # - n_betting: davon die mit Chips > 0 (können noch setzen)
+    # - _bet_counts: Einsatz -> Anzahl Betting-Spieler mit diesem Einsatz
+    #   (alle gleich <=> genau ein Key)
+    n_active: int = 0
+    n_betting: int = 0
+    _bet_counts: Dict[int, int] = field(default_factory=dict)
+
+    # Spiegel-Liste der Player für Iteration: Listen iterieren schneller
+    # als dict.values() und die Hot-Loops (Dealing, Resets, AFK-Sweep)
+    # müssen keine Wegwerf-Listen mehr bauen. self.players bleibt für
+    # O(1)-Lookup per user_id.
+    _players_list: List[Player] = field(default_factory=list)
+
+    # Bitmaske über turn_order-Positionen: Bit i gesetzt <=> Spieler an
+    # Position i ist noch handlungsfähig (nicht gefoldet, Chips > 0).
+    # next_turn() wird damit Bit-Rotation + ctz statt Dict-Lookups.
+    _active_mask: int = 0
+    _turn_pos: Dict[int, int] = field(default_factory=dict)
+
+    # Cache für den gerenderten Board-Text (siehe main.board_text):
+    # das Board ändert sich nur beim Street-Wechsel, nicht pro Klick.
+    board_text_cache: str = "—"
+    board_text_stage: Optional[Stage] = None
+
     # =====================================================
     #                  PLAYER MANAGEMENT
     # =====================================================
@@ -89,17 +190,58 @@ class Table:
                 avatar_file_id=avatar_file_id,
                 chips=self.starting_chips,
             )
+            self._players_list.append(self.players[user_id])
+            self.n_active += 1
+            self.n_betting += 1
+            self._bet_counts[0] = self._bet_counts.get(0, 0) + 1
 
     def remove_player(self, user_id: int):
-        if user_id in self.players:
-            del self.players[user_id]
+        p = self.players.pop(user_id, None)
+        if p is not None:
+            self._players_list.remove(p)
+            self._clear_actionable(user_id)
+            if not p.folded:
+                self.n_active -= 1
+                if p.chips > 0:
+                    self._sync_bet(p)
+                    self.n_betting -= 1
+                    self._bets_drop(p.current_bet)
+
+    # --- Zähler-Helfer für die Einsatz-Verteilung -------------------
+
+    def _bets_drop(self, bet: int):
+        """Ein Betting-Spieler verlässt die Verteilung (Fold / All-in)."""
+        n = self._bet_counts.get(bet, 0) - 1
+        if n > 0:
+            self._bet_counts[bet] = n
+        else:
+            self._bet_counts.pop(bet, None)
+
+    def _bets_move(self, old_bet: int, new_bet: int):
+        """Einsatz eines Betting-Spielers ändert sich."""
+        self._bets_drop(old_bet)
+        self._bet_counts[new_bet] = self._bet_counts.get(new_bet, 0) + 1
+
+    def _reset_street_bets(self):
+        """Alle Einsätze der Setzrunde auf 0 – nur Epoche & Zähler."""
+        self.current_bet = 0
+        self.bet_epoch += 1
+        self._bet_counts.clear()
+        if self.n_betting:
+            self._bet_counts[0] = self.n_betting
+
+    def _sync_bet(self, p: Player):
+        """Lazy-Reset: Einsatz aus einer alten Street zählt als 0."""
+        if p.bet_epoch != self.bet_epoch:
+            p.current_bet = 0
+            p.bet_epoch = self.bet_epoch
 
     def active_players(self) -> List[Player]:
         """
         Aktive Spieler = alle, die NICHT gefoldet haben.
         Auch Spieler mit 0 Chips (ALL-IN) bleiben aktiv für das Showdown.
         """
-        return [p for p in self.players.values() if not p.folded]
+        return [p for p in self._players_list if not p.folded]
 
     # =====================================================
     #                  HAND / ROUND SETUP
@@ -115,12 +257,22 @@ class Table:
         - Stage auf PREFLOP
         """
         self.deck = create_deck()
+        self.deck_idx = 0
         self.community_cards.clear()
         self.pot = 0
         self.current_bet = 0
 
-        for p in self.players.values():
+        self.bet_epoch += 1
+        for p in self._players_list:
             p.reset_for_new_hand()
+            p.bet_epoch = self.bet_epoch
+
+        # Zähler neu aufsetzen: alle wieder aktiv, Einsätze bei 0
+        self.n_active = len(self.players)
+        self.n_betting = sum(1 for p in self._players_list if p.chips > 0)
+        self._bet_counts.clear()
+        if self.n_betting:
+            self._bet_counts[0] = self.n_betting
 
         # Alle Spieler zufällig mischen (keine Bots mehr)
         if self.players:
@@ -128,40 +280,57 @@ class Table:
             random.shuffle(ids)
             self.turn_order = ids
             self.current_turn_idx = 0
+            self._turn_pos = {uid: i for i, uid in enumerate(ids)}
+            mask = (1 << len(ids)) - 1
+            for i, uid in enumerate(ids):
+                if self.players[uid].chips <= 0:
+                    mask &= ~(1 << i)
+            self._active_mask = mask
 
         self.stage = Stage.PREFLOP
 
+    def _clear_actionable(self, user_id: int):
+        """Bit des Spielers löschen (Fold oder All-in)."""
+        pos = self._turn_pos.get(user_id)
+        if pos is not None:
+            self._active_mask &= ~(1 << pos)
+
+    def _draw(self) -> int:
+        """Nächste Karte vom Cursor; das Deck selbst bleibt unverändert."""
+        card = self.deck[self.deck_idx]
+        self.deck_idx += 1
+        return card
+
     def deal_hole_cards(self):
         """Gibt jedem Spieler zwei Hole Cards."""
-        for player in self.players.values():
-            player.hole_cards = [self.deck.pop(), self.deck.pop()]
+        players = self._players_list
+        start = self.deck_idx
+        # Ein Slice für alle Hole Cards statt 2×N Einzel-Draws
+        chunk = self.deck[start:start + 2 * len(players)]
+        self.deck_idx = start + 2 * len(players)
+        for i, player in enumerate(players):
+            player.hole_cards = chunk[2 * i:2 * i + 2]
 
     def deal_flop(self):
         """Burn + 3 Community Cards."""
-        self.deck.pop()
-        self.community_cards.extend([self.deck.pop(), self.deck.pop(), self.deck.pop()])
+        self.deck_idx += 1  # burn
+        self.community_cards.extend([self._draw(), self._draw(), self._draw()])
         self.stage = Stage.FLOP
-        self.current_bet = 0
-        for p in self.players.values():
-            p.current_bet = 0
+        self._reset_street_bets()
 
     def deal_turn(self):
         """Burn + 1 Community Card (Turn)."""
-        self.deck.pop()
-        self.community_cards.append(self.deck.pop())
+        self.deck_idx += 1  # burn
+        self.community_cards.append(self._draw())
         self.stage = Stage.TURN
-        self.current_bet = 0
-        for p in self.players.values():
-            p.current_bet = 0
+        self._reset_street_bets()
 
     def deal_river(self):
         """Burn + 1 Community Card (River)."""
-        self.deck.pop()
-        self.community_cards.append(self.deck.pop())
+        self.deck_idx += 1  # burn
+        self.community_cards.append(self._draw())
         self.stage = Stage.RIVER
-        self.current_bet = 0
-        for p in self.players.values():
-            p.current_bet = 0
+        self._reset_street_bets()
 
     # =====================================================
     #                    TURN ORDER
@@ -172,18 +341,35 @@ class Table:
         Advance to next player that:
         - nicht gefoldet hat
         - noch Chips > 0 hat (sonst ist er effectively ALL-IN und hat keine Aktionen mehr)
+
+        Läuft über die _active_mask: Maske zum Startpunkt rotieren und
+        das niedrigste gesetzte Bit nehmen – O(1) statt Schleife mit
+        Dict-Lookups.
         """
-        if not self.turn_order:
+        n = len(self.turn_order)
+        mask = self._active_mask
+        if not n or not mask:
             return None
 
-        for _ in range(len(self.turn_order)):
-            self.current_turn_idx = (self.current_turn_idx + 1) % len(self.turn_order)
-            uid = self.turn_order[self.current_turn_idx]
-            p = self.players.get(uid)
-            # Spieler mit 0 Chips sind ALL-IN -> keine Action mehr, aber bleiben im Showdown
-            if p and not p.folded and p.chips > 0:
-                return uid
-        return None
+        # Heads-up-Fast-Path: die meisten BMT-Tische sind 1-gegen-1.
+        # Statt Rotation reicht ein XOR auf den Sitz-Index.
+        if n == 2:
+            other = self.current_turn_idx ^ 1
+            if (mask >> other) & 1:
+                self.current_turn_idx = other
+                return self.turn_order[other]
+            if (mask >> self.current_turn_idx) & 1:
+                return self.turn_order[self.current_turn_idx]
+            return None
+
+        start = self.current_turn_idx + 1
+        full = (1 << n) - 1
+        rot = ((mask >> start) | (mask << (n - start))) & full
+        if not rot:
+            return None
+        offset = (rot & -rot).bit_length() - 1
+        self.current_turn_idx = (start + offset) % n
+        return self.turn_order[self.current_turn_idx]
 
     def current_player_id(self) -> Optional[int]:
         """
@@ -196,10 +382,8 @@ class Table:
         """
         if not self.turn_order:
             return None
-        uid = self.turn_order[self.current_turn_idx]
-        p = self.players.get(uid)
-        if p and not p.folded and p.chips > 0:
-            return uid
+        if (self._active_mask >> self.current_turn_idx) & 1:
+            return self.turn_order[self.current_turn_idx]
         return self.next_turn()
 
     # =====================================================
@@ -208,7 +392,14 @@ class Table:
 
     def fold(self, user_id: int):
         p = self.players[user_id]
-        p.folded = True
+        if not p.folded:
+            p.folded = True
+            self.n_active -= 1
+            self._clear_actionable(user_id)
+            if p.chips > 0:
+                self._sync_bet(p)
+                self.n_betting -= 1
+                self._bets_drop(p.current_bet)
 
     def check_or_call(self, user_id: int) -> int:
         """
@@ -217,14 +408,24 @@ class Table:
         Rückgabe: Betrag, der in dieser Action in den Pot geht.
         """
         p = self.players[user_id]
+        self._sync_bet(p)
         to_call = self.current_bet - p.current_bet
         if to_call <= 0:
             # reiner Check
             return 0
         amount = min(to_call, p.chips)
+        old_bet = p.current_bet
         p.chips -= amount
         p.current_bet += amount
         self.pot += amount
+
+        if p.chips > 0:
+            self._bets_move(old_bet, p.current_bet)
+        else:
+            # ALL-IN -> zählt nicht mehr als Betting-Spieler
+            self.n_betting -= 1
+            self._bets_drop(old_bet)
+            self._clear_actionable(user_id)
         return amount
 
     def raise_bet(self, user_id: int, amount: int) -> int:
@@ -236,13 +437,22 @@ class Table:
         - current_bet folgt dem höchsten Einsatz
         """
         p = self.players[user_id]
+        self._sync_bet(p)
         to_call = self.current_bet - p.current_bet
         total_needed = to_call + amount
         total = min(total_needed, p.chips)
+        old_bet = p.current_bet
         p.chips -= total
         p.current_bet += total
         self.pot += total
 
+        if p.chips > 0:
+            self._bets_move(old_bet, p.current_bet)
+        else:
+            self.n_betting -= 1
+            self._bets_drop(old_bet)
+            self._clear_actionable(user_id)
+
         # Höchsten Einsatz übernehmen
         if p.current_bet > self.current_bet:
             self.current_bet = p.current_bet
@@ -263,22 +473,15 @@ class Table:
         - Wenn es nur 0 oder 1 aktive Spieler gibt -> Runde de facto beendet.
         - Wenn es keine Spieler mit Chips > 0 gibt (alle all-in) -> Runde beendet.
         - Sonst müssen alle Spieler mit Chips > 0 denselben current_bet haben.
-        """
-        active = [p for p in self.players.values() if not p.folded]
 
-        # 0 oder 1 aktiver Spieler -> Setzrunde/Hand de facto beendet
-        if len(active) <= 1:
+        Dank der laufenden Zähler (n_active / n_betting / _bet_counts)
+        ist das ein reiner O(1)-Check ohne Allokationen.
+        """
+        if self.n_active <= 1:
             return True
-
-        # Spieler, die noch Chips haben (können theoretisch noch setzen)
-        betting_players = [p for p in active if p.chips > 0]
-
-        # Wenn niemand mehr Chips hat (alle all-in) -> Runde abgeschlossen
-        if not betting_players:
+        if self.n_betting == 0:
             return True
-
-        bets = {p.current_bet for p in betting_players}
-        return len(bets) == 1
+        return len(self._bet_counts) == 1
 
     def advance_stage_if_needed(self):
         """
@@ -293,8 +496,7 @@ class Table:
             return
 
         # wenn nur ein Spieler übrig ist (alle anderen gefoldet)
-        active = [p for p in self.players.values() if not p.folded]
-        if len(active) == 1:
+        if self.n_active == 1:
             # Sofortiger Gewinner – Showdown ohne weiteres Board.
             self.stage = Stage.SHOWDOWN
             return
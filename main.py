@@ -5,7 +5,10 @@ from typing import Dict, Optional, List
 import random
 import itertools
 import asyncio
+import heapq
+import html
 import math
+from functools import lru_cache
 from io import BytesIO
 from PIL import Image
 
@@ -26,7 +29,7 @@ from telegram.ext import (
     filters,
 )
 
-from game import Table, Stage
+from game import Table, Stage, card_code
 import storage
 
 
@@ -58,24 +61,101 @@ TABLE_VIEW_VIDEO_PATH = ROOT_DIR / "assets" / "ui" / "table_view.mp4"
 WINNER_VIDEO_PATH = ROOT_DIR / "assets" / "ui" / "winner.mp4"
 WINNER_PATH = ROOT_DIR / "assets" / "ui" / "winner.png"
 
+# Häufig verschickte Assets einmal beim Start von der Platte lesen.
+# Jeder Join/Start/View-Klick hat die Dateien vorher synchron im Event
+# Loop geöffnet – blockierendes Disk-I/O mitten im Handler.
+CHIP_BYTES = CHIP_PATH.read_bytes() if CHIP_PATH.exists() else None
+TABLE_VIEW_VIDEO_BYTES = (
+    TABLE_VIEW_VIDEO_PATH.read_bytes() if TABLE_VIEW_VIDEO_PATH.exists() else None
+)
+TABLE_VIEW_IMAGE_BYTES = TABLE_VIEW_IMAGE.read_bytes() if TABLE_VIEW_IMAGE.exists() else None
+WINNER_VIDEO_BYTES = WINNER_VIDEO_PATH.read_bytes() if WINNER_VIDEO_PATH.exists() else None
+WINNER_BYTES = WINNER_PATH.read_bytes() if WINNER_PATH.exists() else None
+BACK_BYTES = BACK_PATH.read_bytes() if BACK_PATH.exists() else None
+
 
 # ============================================================
 #                    CARD IMAGE UTILITIES
 # ============================================================
 
-def card_path(code: str) -> Path:
-    return FRONT_DIR / f"{code}.png"
+# Karten-Verzeichnis einmal beim Start scannen: Dict-Membership ersetzt
+# die exists()-Stats pro Karte und Render im Telegram-Hot-Path.
+_CARD_PATHS: Dict[str, Path] = (
+    {p.stem: p for p in FRONT_DIR.glob("*.png")} if FRONT_DIR.is_dir() else {}
+)
 
 
-def build_cards_sprite(cards: list[str], per_row: int = 2) -> Optional[BytesIO]:
-    """Builds one combined PNG sprite from list of card images."""
+def card_path(code: str) -> Optional[Path]:
+    return _CARD_PATHS.get(code)
+
+
+# Telegram-file_ids der statischen Assets nach dem ersten Upload.
+# file_ids sind pro Bot permanent – danach kommt das Bild aus Telegrams
+# CDN statt als Multipart-Upload von uns.
+_FILE_IDS: Dict[str, str] = {}
+
+
+def _cached_media(key: str, data: bytes, filename: str):
+    """file_id falls schon hochgeladen, sonst frischer Upload-Buffer."""
+    fid = _FILE_IDS.get(key)
+    if fid is not None:
+        return fid
+    return InputFile(BytesIO(data), filename=filename)
+
+
+def _remember_file_id(key: str, message) -> None:
+    """file_id aus der Send-Antwort merken (Foto oder Video)."""
+    if key in _FILE_IDS or message is None:
+        return
+    try:
+        if message.photo:
+            _FILE_IDS[key] = message.photo[-1].file_id
+        elif message.video:
+            _FILE_IDS[key] = message.video.file_id
+    except Exception:
+        pass
+
+
+@lru_cache(maxsize=64)
+def _load_card(code: str) -> Optional[Image.Image]:
+    """Dekodiertes Kartenbild aus dem Cache (PNG-Decode nur einmal)."""
+    p = _CARD_PATHS.get(code)
+    if p is None:
+        return None
+    return Image.open(p).convert("RGBA")
+
+
+def cards_text(cards: list[int]) -> str:
+    """Int-Karten -> Anzeige wie "AS, 10H, 2C" (oder "—" wenn leer)."""
+    return ", ".join(card_code(c) for c in cards) if cards else "—"
+
+
+def board_text(table: Table) -> str:
+    """Board-String einmal pro Street rendern statt pro Klick.
+
+    Invalidiert sich über die Stage: nach Flop/Turn/River wird neu
+    gejoint, dazwischen ist es ein Attribut-Read.
+    """
+    if table.board_text_stage is not table.stage:
+        table.board_text_cache = cards_text(table.community_cards)
+        table.board_text_stage = table.stage
+    return table.board_text_cache
+
+
+@lru_cache(maxsize=4096)
+def _sprite_bytes(cards: tuple[int, ...], per_row: int) -> Optional[bytes]:
+    """Komponiert + encodiert das Sprite einmal pro Kartenkombination.
+
+    Dasselbe Board wird von allen Spielern angeschaut – die fertig
+    encodierten Bytes werden gecacht statt jedes Mal neu gebaut.
+    4096 Slots decken alle 1326 Hole-Card-Paare plus die Flops einer
+    langen Session; ein Eintrag ist nur ein kleines WEBP (~wenige KB).
+    """
     images = []
-    for code in cards:
-        p = card_path(code)
-        if not p.exists():
-            continue
-        img = Image.open(p).convert("RGBA")
-        images.append(img)
+    for card in cards:
+        img = _load_card(card_code(card))
+        if img is not None:
+            images.append(img)
 
     if not images:
         return None
@@ -92,9 +172,21 @@ def build_cards_sprite(cards: list[str], per_row: int = 2) -> Optional[BytesIO]:
         sprite.paste(img, (c * w, r * h), img)
 
     buf = BytesIO()
-    sprite.save(buf, format="PNG")
-    buf.seek(0)
-    return buf
+    # WEBP encodiert deutlich schneller als PNGs zlib und die Uploads
+    # werden kleiner; Alpha bleibt erhalten.
+    sprite.save(buf, format="WEBP", quality=85, method=4)
+    return buf.getvalue()
+
+
+def build_cards_sprite(cards: list[int], per_row: int = 2) -> Optional[BytesIO]:
+    """Builds one combined PNG sprite from list of card images."""
+    data = _sprite_bytes(tuple(cards), per_row)
+    return BytesIO(data) if data is not None else None
+
+
+# Akzeptierte Schreibweisen für "alles rein" – einmal als frozenset
+# statt pro Klick ein frisches Tupel linear zu durchsuchen.
+ALLIN_TOKENS: frozenset[str] = frozenset({"all", "allin", "all-in"})
 
 
 # ============================================================
@@ -125,77 +217,175 @@ def get_table(update: Update, create: bool = False) -> Optional[Table]:
 #                      MENUS
 # ============================================================
 
-def main_menu_keyboard() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
+# Die Menü-Keyboards sind komplett statisch – einmal bauen statt pro
+# Klick ~15 Button-Objekte zu allozieren. Telegram-seitig sind die
+# Markups ohnehin immutable.
+_MAIN_MENU_KB = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("🎛 Poker Session Setup", callback_data="setup_menu")],
         [
-            [InlineKeyboardButton("🎛 Poker Session Setup", callback_data="setup_menu")],
-            [
-                InlineKeyboardButton("🏆 Leaderboard", callback_data="show_leaderboard"),
-                InlineKeyboardButton("📊 Table Stats", callback_data="show_stats"),
-            ],
-            [InlineKeyboardButton("📜 Rules & Commands", callback_data="show_rules")],
-        ]
-    )
+            InlineKeyboardButton("🏆 Leaderboard", callback_data="show_leaderboard"),
+            InlineKeyboardButton("📊 Table Stats", callback_data="show_stats"),
+        ],
+        [InlineKeyboardButton("📜 Rules & Commands", callback_data="show_rules")],
+    ]
+)
 
+_SETUP_MENU_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("⚙️ Chips", callback_data="cfg_chips"),
+            InlineKeyboardButton("🎯 Rounds", callback_data="cfg_rounds"),
+        ],
+        [
+            InlineKeyboardButton("👥 Players", callback_data="cfg_players"),
+        ],
+        [InlineKeyboardButton("ℹ️ Setup Guide", callback_data="setup_help")],
+        [InlineKeyboardButton("♻ Reset Table", callback_data="reset_table")],
+        [InlineKeyboardButton("🎬 Start Poker Session", callback_data="start_session")],
+        [InlineKeyboardButton("⬅ Back to Main Menu", callback_data="back_main")],
+    ]
+)
 
-def setup_menu_keyboard() -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
+_ACTION_KB = InlineKeyboardMarkup(
+    [
         [
-            [
-                InlineKeyboardButton("⚙️ Chips", callback_data="cfg_chips"),
-                InlineKeyboardButton("🎯 Rounds", callback_data="cfg_rounds"),
-            ],
-            [
-                InlineKeyboardButton("👥 Players", callback_data="cfg_players"),
-            ],
-            [InlineKeyboardButton("ℹ️ Setup Guide", callback_data="setup_help")],
-            [InlineKeyboardButton("♻ Reset Table", callback_data="reset_table")],
-            [InlineKeyboardButton("🎬 Start Poker Session", callback_data="start_session")],
-            [InlineKeyboardButton("⬅ Back to Main Menu", callback_data="back_main")],
-        ]
-    )
+            InlineKeyboardButton("✅ Check/Call", callback_data="act:call"),
+            InlineKeyboardButton("💸 Raise", callback_data="act:raise_menu"),
+            InlineKeyboardButton("🏳️ Fold", callback_data="act:fold"),
+        ],
+        [
+            InlineKeyboardButton("🂷 Show Board", callback_data="show_board"),
+            InlineKeyboardButton("👀 View Table", callback_data="view_round"),
+        ],
+    ]
+)
+
+# Raise menu with fixed + custom + ALL-IN.
+# Beträge passen zu den hohen Stacks (z.B. 250k+ Startchips)
+# und die angezeigten Zahlen stimmen mit dem echten Raise überein.
+_RAISE_MENU_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("Raise 10 000", callback_data="raiseamt:10000"),
+            InlineKeyboardButton("Raise 50 000", callback_data="raiseamt:50000"),
+        ],
+        [
+            InlineKeyboardButton("Raise 100 000", callback_data="raiseamt:100000"),
+            InlineKeyboardButton("Raise 250 000", callback_data="raiseamt:250000"),
+        ],
+        [InlineKeyboardButton("ALL-IN", callback_data="raiseamt:all")],
+        [
+            InlineKeyboardButton("✏ Custom", callback_data="raise_custom"),
+            InlineKeyboardButton("⬅ Back", callback_data="back_actions"),
+        ],
+    ]
+)
+
+
+def main_menu_keyboard() -> InlineKeyboardMarkup:
+    return _MAIN_MENU_KB
+
+
+def setup_menu_keyboard() -> InlineKeyboardMarkup:
+    return _SETUP_MENU_KB
 
 
 def build_action_keyboard() -> InlineKeyboardMarkup:
     """Buttons shown during a hand."""
-    return InlineKeyboardMarkup(
-        [
-            [
-                InlineKeyboardButton("✅ Check/Call", callback_data="act:call"),
-                InlineKeyboardButton("💸 Raise", callback_data="act:raise_menu"),
-                InlineKeyboardButton("🏳️ Fold", callback_data="act:fold"),
-            ],
-            [
-                InlineKeyboardButton("🂷 Show Board", callback_data="show_board"),
-                InlineKeyboardButton("👀 View Table", callback_data="view_round"),
-            ],
-        ]
-    )
+    return _ACTION_KB
 
 
 def build_raise_menu() -> InlineKeyboardMarkup:
-    """
-    Raise menu with fixed + custom + ALL-IN.
-    Beträge passen jetzt zu den hohen Stacks (z.B. 250k+ Startchips)
-    und die angezeigten Zahlen stimmen mit dem echten Raise überein.
-    """
-    return InlineKeyboardMarkup(
+    return _RAISE_MENU_KB
+
+
+# Auch die Setup-Untermenüs und Join/Start-Leisten sind statisch.
+_BACK_MAIN_KB = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("⬅ Back", callback_data="back_main")]]
+)
+
+_SETUP_BACK_KB = InlineKeyboardMarkup(
+    [[InlineKeyboardButton("⬅ Back", callback_data="setup_menu")]]
+)
+
+_CHIPS_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("250000", callback_data="set_chips:250000"),
+            InlineKeyboardButton("500000", callback_data="set_chips:500000"),
+        ],
+        [
+            InlineKeyboardButton("1000000", callback_data="set_chips:1000000"),
+            InlineKeyboardButton("2500000", callback_data="set_chips:2500000"),
+        ],
+        [InlineKeyboardButton("⬅ Back", callback_data="setup_menu")],
+    ]
+)
+
+_ROUNDS_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("5", callback_data="set_hands:5"),
+            InlineKeyboardButton("10", callback_data="set_hands:10"),
+        ],
+        [
+            InlineKeyboardButton("20", callback_data="set_hands:20"),
+            InlineKeyboardButton("∞ Free Play", callback_data="set_hands:0"),
+        ],
+        [InlineKeyboardButton("⬅ Back", callback_data="setup_menu")],
+    ]
+)
+
+_PLAYERS_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("2", callback_data="set_players:2"),
+            InlineKeyboardButton("3", callback_data="set_players:3"),
+            InlineKeyboardButton("4", callback_data="set_players:4"),
+        ],
         [
-            [
-                InlineKeyboardButton("Raise 10 000", callback_data="raiseamt:10000"),
-                InlineKeyboardButton("Raise 50 000", callback_data="raiseamt:50000"),
-            ],
-            [
-                InlineKeyboardButton("Raise 100 000", callback_data="raiseamt:100000"),
-                InlineKeyboardButton("Raise 250 000", callback_data="raiseamt:250000"),
-            ],
-            [InlineKeyboardButton("ALL-IN", callback_data="raiseamt:all")],
-            [
-                InlineKeyboardButton("✏ Custom", callback_data="raise_custom"),
-                InlineKeyboardButton("⬅ Back", callback_data="back_actions"),
-            ],
+            InlineKeyboardButton("6", callback_data="set_players:6"),
+            InlineKeyboardButton("8", callback_data="set_players:8"),
+            InlineKeyboardButton("Unlimited", callback_data="set_players:0"),
+        ],
+        [InlineKeyboardButton("⬅ Back", callback_data="setup_menu")],
+    ]
+)
+
+_SESSION_KB = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("🧑‍💻 Join Table", callback_data="join_table")],
+        [InlineKeyboardButton("🎬 Start Hand", callback_data="start_hand")],
+    ]
+)
+
+_JOIN_START_KB = InlineKeyboardMarkup(
+    [
+        [
+            InlineKeyboardButton("🧑‍💻 Join Table", callback_data="join_table"),
+            InlineKeyboardButton("🎬 Start Hand", callback_data="start_hand"),
         ]
-    )
+    ]
+)
+
+# Nach Showdown / AFK-Auto-Win: New Hand + Leaderboard/Stats
+_SHOWDOWN_KB = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("🎬 New Hand", callback_data="start_hand")],
+        [
+            InlineKeyboardButton("🏆 Leaderboard", callback_data="show_leaderboard"),
+            InlineKeyboardButton("📊 Table Stats", callback_data="show_stats"),
+        ],
+    ]
+)
+
+_MATCH_FINISHED_KB = InlineKeyboardMarkup(
+    [
+        [InlineKeyboardButton("⬅ Back to Menu", callback_data="back_main")],
+        [InlineKeyboardButton("🎛 Poker Session Setup", callback_data="setup_menu")],
+    ]
+)
 
 
 # ============================================================
@@ -251,9 +441,7 @@ async def send_rules(chat_id: int, thread_id: Optional[int], context: ContextTyp
         text=text,
         parse_mode="Markdown",
         message_thread_id=thread_id,
-        reply_markup=InlineKeyboardMarkup(
-            [[InlineKeyboardButton("⬅ Back", callback_data="back_main")]]
-        ),
+        reply_markup=_BACK_MAIN_KB,
     )
 
 
@@ -268,8 +456,7 @@ async def send_leaderboard(chat_id: int, thread_id: int, context):
                 text="🏆 No leaderboard yet.",
                 message_thread_id=thread_id
             )
-            await asyncio.sleep(10)
-            await msg.delete()
+            schedule_delete(chat_id, msg.message_id, delay=10)
             return
 
         lines = ["🏆 BMT Leaderboard\n"]
@@ -288,8 +475,7 @@ async def send_leaderboard(chat_id: int, thread_id: int, context):
             message_thread_id=thread_id
         )
 
-        await asyncio.sleep(10)
-        await msg.delete()
+        schedule_delete(chat_id, msg.message_id, delay=10)
 
     except Exception as e:
         await context.bot.send_message(
@@ -308,8 +494,7 @@ async def send_table_stats(chat_id: int, thread_id: int, table, context):
                 text="📊 No players at the table.",
                 message_thread_id=thread_id
             )
-            await asyncio.sleep(10)
-            await msg.delete()
+            schedule_delete(chat_id, msg.message_id, delay=10)
             return
 
         lines = []
@@ -319,8 +504,7 @@ async def send_table_stats(chat_id: int, thread_id: int, table, context):
         lines.append(f"• Players: {len(table.players)}")
         lines.append(f"• Stage: {table.stage.name}")
         lines.append(f"• Pot: {table.pot} BMT")
-        comm = ", ".join(table.community_cards) if table.community_cards else "—"
-        lines.append(f"• Community: {comm}")
+        lines.append(f"• Community: {cards_text(table.community_cards)}")
         lines.append("")
         lines.append("Players:")
 
@@ -333,8 +517,7 @@ async def send_table_stats(chat_id: int, thread_id: int, table, context):
             message_thread_id=thread_id
         )
 
-        await asyncio.sleep(10)
-        await msg.delete()
+        schedule_delete(chat_id, msg.message_id, delay=10)
 
     except Exception as e:
         await context.bot.send_message(
@@ -397,13 +580,14 @@ async def settable(update: Update, context: ContextTypes.DEFAULT_TYPE):
     table.host_id = HOST_OVERRIDE if HOST_OVERRIDE else user.id
 
     # Welcome graphic
+    # Bytes vor dem await lesen: kein offenes File-Handle über den
+    # Netzwerk-Suspend hinweg
     if WELCOME_PATH.exists():
-        with open(WELCOME_PATH, "rb") as f:
-            await msg.reply_photo(
-                InputFile(f),
-                caption="🃏 Welcome to *BMT Texas Hold'em*!",
-                parse_mode="Markdown",
-            )
+        await msg.reply_photo(
+            InputFile(BytesIO(WELCOME_PATH.read_bytes()), filename="welcome.png"),
+            caption="🃏 Welcome to *BMT Texas Hold'em*!",
+            parse_mode="Markdown",
+        )
 
     await msg.reply_text(
         "This topic is now a poker table.\n"
@@ -412,135 +596,201 @@ async def settable(update: Update, context: ContextTypes.DEFAULT_TYPE):
     )
 
 
-async def auto_delete_message(
-    context: ContextTypes.DEFAULT_TYPE,
-    chat_id: int,
-    message_id: int,
-    delay: int = 20,
-):
-    """Delete a message after <delay> seconds, ignoring errors."""
-    await asyncio.sleep(delay)
-    try:
-        await context.bot.delete_message(chat_id=chat_id, message_id=message_id)
-    except Exception:
-        pass
+# Zentraler Auto-Delete-Reaper statt einem create_task pro Nachricht:
+# jeder geplante Delete ist nur noch ein Heap-Eintrag, kein eigener
+# Coroutine-Frame, der 10-25 Sekunden lang lebt. Gleiches Muster wie
+# beim AFK-Watcher: ein Task, der bis zum nächsten fälligen Eintrag
+# schläft und bei früheren Deadlines per Event geweckt wird.
+_DELETE_HEAP: list[tuple[float, int, int]] = []
+_DELETE_WAKEUP = asyncio.Event()
+
+
+def schedule_delete(chat_id: int, message_id: int, delay: float = 20) -> None:
+    """Merkt eine Nachricht zum Löschen in <delay> Sekunden vor."""
+    due = asyncio.get_running_loop().time() + delay
+    heapq.heappush(_DELETE_HEAP, (due, chat_id, message_id))
+    if _DELETE_HEAP[0][0] == due:
+        _DELETE_WAKEUP.set()
+
+
+async def delete_reaper_loop(app):
+    loop = asyncio.get_running_loop()
+    while True:
+        timeout = max(0.0, _DELETE_HEAP[0][0] - loop.time()) if _DELETE_HEAP else None
+        try:
+            await asyncio.wait_for(_DELETE_WAKEUP.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        _DELETE_WAKEUP.clear()
+        await _delete_process_due(app)
+
+
+async def _delete_process_due(app):
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+    while _DELETE_HEAP and _DELETE_HEAP[0][0] <= now:
+        _due, chat_id, message_id = heapq.heappop(_DELETE_HEAP)
+        try:
+            await app.bot.delete_message(chat_id=chat_id, message_id=message_id)
+        except Exception:
+            pass
 
 
 AFK_WARNING_SECONDS = 120     # 2 minutes → send funny warning
 AFK_KICK_SECONDS = 300        # 5 minutes → auto-fold & remove player
 
+# Expiry-Min-Heap statt Full-Scan über alle Tische/Spieler pro Tick.
+# Einträge: (fällig_um, kind, table_key, user_id, stamp)
+# stamp = last_action_time beim Push; stimmt er beim Pop nicht mehr mit
+# dem Spieler überein, hat der inzwischen geklickt -> Eintrag ist stale.
+_AFK_HEAP: list[tuple[float, str, tuple[int, Optional[int]], int, float]] = []
+
+# Weckt den Watcher-Task, wenn ein neuer (evtl. früher fälliger) Timer
+# auf den Heap kommt – statt alle 5s blind nachzuschauen.
+_AFK_WAKEUP = asyncio.Event()
 
-async def afk_watcher_job(context: ContextTypes.DEFAULT_TYPE):
+
+def touch_player(table: Table, p, now: float):
+    """AFK-Stempel setzen und Warn-Timer neu aufziehen."""
+    p.last_action_time = now
+    p.afk_warned = False
+    heapq.heappush(
+        _AFK_HEAP,
+        (now + AFK_WARNING_SECONDS, "warn", (table.chat_id, table.thread_id), p.user_id, now),
+    )
+    _AFK_WAKEUP.set()
+
+
+async def afk_watcher_loop(app):
+    """
+    Ein einziger Task statt JobQueue-Polling alle 5 Sekunden: schläft
+    exakt bis zum nächsten fälligen Heap-Eintrag und wird von
+    touch_player über das Event geweckt, falls ein früherer Timer
+    dazukommt. Ohne Spieler gibt es gar keine Wakeups mehr.
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        timeout = max(0.0, _AFK_HEAP[0][0] - loop.time()) if _AFK_HEAP else None
+        try:
+            await asyncio.wait_for(_AFK_WAKEUP.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        _AFK_WAKEUP.clear()
+        await _afk_process_due(app)
+
+
+async def _afk_process_due(app):
     """
-    Wird regelmäßig vom JobQueue aufgerufen.
     Warnt nach 2 Minuten und foldet nach 5 Minuten AFK-Spieler.
     Die BMT-Chips bleiben im Pot.
     Wenn danach nur noch 1 Spieler übrig ist, gewinnt der automatisch den Pot.
+
+    Statt alle Tische und Spieler zu scannen, werden nur die fälligen
+    Einträge vom Heap gepoppt – im Leerlauf kostet der Aufruf nichts.
     """
-    now = asyncio.get_event_loop().time()
-    app = context.application
+    # get_running_loop ist der schnelle C-Pfad (kein Policy-Lookup),
+    # und die heißen Globals einmal lokal binden (LOAD_FAST im Loop).
+    now = asyncio.get_running_loop().time()
+    heap = _AFK_HEAP
+    tables = TABLES
+    heappush, heappop = heapq.heappush, heapq.heappop
+    kick_seconds = AFK_KICK_SECONDS
+
+    changed_tables: dict[tuple[int, Optional[int]], Table] = {}
+    # Sends sammeln und am Ende parallel abschicken: der Tick dauert
+    # dann max(RTT) statt sum(RTT) über alle Tische.
+    coros = []
+
+    while heap and heap[0][0] <= now:
+        _due, kind, key, uid, stamp = heappop(heap)
+
+        table = tables.get(key)
+        if not table:
+            continue
+        p = table.players.get(uid)
+        # Bereits gefoldet oder zwischenzeitlich geklickt -> stale
+        if p is None or p.folded or p.last_action_time != stamp:
+            continue
 
-    # Alle Tische durchgehen
-    for (chat_id, thread_id), table in list(TABLES.items()):
-        changed = False  # hat sich am Tisch etwas getan (Fold)?
+        chat_id, thread_id = key
 
-        for p in list(table.players.values()):
-            # Bereits gefoldete Spieler nicht prüfen
-            if getattr(p, "folded", False):
-                continue
+        if kind == "warn":
+            p.afk_warned = True
+            # Kick-Timer für denselben Stempel nachlegen
+            heappush(heap, (stamp + kick_seconds, "kick", key, uid, stamp))
+            coros.append(
+                app.bot.send_message(
+                    chat_id=chat_id,
+                    message_thread_id=thread_id,
+                    text=(
+                        f"😴 {p.name} is falling asleep at the table...\n"
+                        "Maxi, click something or I'll fold you like a cheap lawn chair!"
+                    ),
+                )
+            )
 
-            # Kein Timestamp → z.B. gerade erst gejoint
-            last = getattr(p, "last_action_time", None)
-            if last is None:
-                continue
+        else:  # kick
+            table.fold(uid)   # Chips bleiben im Pot
+            changed_tables[key] = table
+            coros.append(
+                app.bot.send_message(
+                    chat_id=chat_id,
+                    message_thread_id=thread_id,
+                    text=(
+                        f"💤 {p.name} has been AFK too long and got folded.\n"
+                        "Those Tears stay in the pot — thanks for the donation! 💧💰"
+                    ),
+                )
+            )
 
-            diff = now - last
-
-            # 1) Kick nach 5 Minuten hat Vorrang
-            if diff >= AFK_KICK_SECONDS:
-                table.fold(p.user_id)   # Chips bleiben im Pot
-                changed = True
-                try:
-                    await app.bot.send_message(
-                        chat_id=chat_id,
-                        message_thread_id=thread_id,
-                        text=(
-                            f"💤 {p.name} has been AFK too long and got folded.\n"
-                            "Those Tears stay in the pot — thanks for the donation! 💧💰"
-                        ),
-                    )
-                except Exception:
-                    pass
-
-            # 2) Warnung nach 2 Minuten (nur, wenn noch nicht gekickt)
-            elif diff >= AFK_WARNING_SECONDS and not getattr(p, "afk_warned", False):
-                p.afk_warned = True
-                try:
-                    await app.bot.send_message(
-                        chat_id=chat_id,
-                        message_thread_id=thread_id,
-                        text=(
-                            f"😴 {p.name} is falling asleep at the table...\n"
-                            "Maxi, click something or I'll fold you like a cheap lawn chair!"
-                        ),
-                    )
-                except Exception:
-                    pass
-
-        # Wenn sich was geändert hat (mindestens ein Fold)
-        if changed:
-            # Aktive Spieler (nicht gefoldet)
-            active = [pl for pl in table.players.values() if not pl.folded]
-
-            # FALL 1: Nur noch 1 Spieler übrig → Auto-Gewinner (auch bei Pot = 0)
-            if len(active) == 1:
-                winner = active[0]
-                pot_amount = table.pot
-
-                # Pot dem Gewinner geben (kann 0 sein)
-                winner.chips += pot_amount
-
-                # Stats speichern (Gewinner + Verlierer)
-                try:
-                    storage.record_hand_result(winner.user_id, pot_amount, True)
-                    for pl in table.players.values():
-                        if pl.user_id != winner.user_id:
-                            storage.record_hand_result(pl.user_id, 0, False)
-                except Exception:
-                    pass
-
-                # Tisch auf Showdown setzen und Pot leeren
-                table.stage = Stage.SHOWDOWN
-                table.pot = 0
-
-                kb = InlineKeyboardMarkup(
-                    [
-                        [InlineKeyboardButton("🎬 New Hand", callback_data="start_hand")],
-                        [
-                            InlineKeyboardButton("🏆 Leaderboard", callback_data="show_leaderboard"),
-                            InlineKeyboardButton("📊 Table Stats", callback_data="show_stats"),
-                        ],
-                    ]
+    # Tische mit mindestens einem AFK-Fold nachbehandeln
+    for (chat_id, thread_id), table in changed_tables.items():
+        # FALL 1: Nur noch 1 Spieler übrig → Auto-Gewinner (auch bei Pot = 0)
+        # (Zähler statt Wegwerf-Liste; fold() hält n_active aktuell)
+        if table.n_active == 1:
+            winner = next(pl for pl in table._players_list if not pl.folded)
+            pot_amount = table.pot
+
+            # Pot dem Gewinner geben (kann 0 sein)
+            winner.chips += pot_amount
+
+            # Stats speichern (Gewinner + Verlierer in einer Transaktion)
+            try:
+                rows = [(winner.user_id, pot_amount, True)]
+                rows += [
+                    (pl.user_id, 0, False)
+                    for pl in table._players_list
+                    if pl.user_id != winner.user_id
+                ]
+                storage.record_hand_results(rows)
+            except Exception:
+                pass
+
+            # Tisch auf Showdown setzen und Pot leeren
+            table.stage = Stage.SHOWDOWN
+            table.pot = 0
+
+            coros.append(
+                app.bot.send_message(
+                    chat_id=chat_id,
+                    message_thread_id=thread_id,
+                    text=(
+                        "🃏 Showdown (AFK Edition)!\n\n"
+                        "Everyone else disappeared into maxi-land.\n"
+                        f"🏆 {winner.name} wins the pot by default.\n\n"
+                        "Hit New Hand to keep the Tears flowing."
+                    ),
+                    reply_markup=_SHOWDOWN_KB,
                 )
+            )
 
-                try:
-                    await app.bot.send_message(
-                        chat_id=chat_id,
-                        message_thread_id=thread_id,
-                        text=(
-                            "🃏 Showdown (AFK Edition)!\n\n"
-                            "Everyone else disappeared into maxi-land.\n"
-                            f"🏆 {winner.name} wins the pot by default.\n\n"
-                            "Hit New Hand to keep the Tears flowing."
-                        ),
-                        reply_markup=kb,
-                    )
-                except Exception:
-                    pass
+        # FALL 2: Es sind noch mehrere aktiv → normal Street-Logik
+        else:
+            table.advance_stage_if_needed()
 
-            # FALL 2: Es sind noch mehrere aktiv → normal Street-Logik
-            else:
-                table.advance_stage_if_needed()
+    if coros:
+        # Fehler einzelner Sends (z.B. gelöschter Chat) ignorieren
+        await asyncio.gather(*coros, return_exceptions=True)
 
 
 async def leaderboard_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -595,421 +845,425 @@ async def fullreset_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE):
 #                      BUTTON HANDLER
 # ============================================================
 
-async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    query = update.callback_query
-    data = query.data
-    user = query.from_user
-    msg = query.message
+# ---------------------------------------------------------
+#  CALLBACK-HANDLER (ein kleiner Handler pro Button)
+# ---------------------------------------------------------
+# button_handler war vorher eine ~30-stufige if/elif-Leiter; jeder Klick
+# hat alle Vergleiche davor bezahlt. Jetzt: ein Dict-Lookup für exakte
+# callback_data plus eine kurze Präfix-Tabelle für "set_chips:" & Co.
 
-    # CallbackQuery kann "zu alt" sein → sauber abfangen
+
+async def _edit_or_reply(query, text, **kwargs):
+    """Menü-Navigation: bestehende Nachricht editieren statt neu posten.
+
+    Ein editMessageText statt answer+send halbiert die API-Calls und
+    spammt den Chat nicht voll. Fällt auf reply_text zurück, wenn die
+    Nachricht nicht editierbar ist (z.B. Foto-Caption oder identischer
+    Inhalt -> "message is not modified").
+    """
     try:
-        await query.answer()
+        await query.edit_message_text(text, **kwargs)
     except BadRequest:
-        # Query zu alt / schon beantwortet – ignorieren
-        return
+        try:
+            await query.message.reply_text(text, **kwargs)
+        except BadRequest:
+            pass
 
-    # ---------------------------------------------------------
-    #  TABLE HOLEN
-    # ---------------------------------------------------------
-    table = get_table(update, create=True)
-    thread_id = msg.message_thread_id
 
-    # AFK-Timestamp für aktive Spieler aktualisieren
-    now = asyncio.get_event_loop().time()
-    if user.id in table.players:
-        setattr(table.players[user.id], "last_action_time", now)
+async def _h_back_main(query, data, table, thread_id, context):
+    await _edit_or_reply(
+        query,
+        "⬅ Back to main table menu.",
+        reply_markup=main_menu_keyboard(),
+    )
 
-    # ---------------------------------------------------------
-    #  HOST-CHECK
-    # ---------------------------------------------------------
-    host_only_prefixes = (
-        "cfg_chips",
-        "cfg_rounds",
-        "cfg_players",
-        "set_chips:",
-        "set_hands:",
-        "set_players:",
-        "reset_table",
-        "setup_menu",
-        "setup_help",
-        "start_session",
-        "start_hand",
+
+async def _h_show_rules(query, data, table, thread_id, context):
+    await send_rules(query.message.chat_id, thread_id, context)
+
+
+async def _h_show_leaderboard(query, data, table, thread_id, context):
+    await send_leaderboard(query.message.chat_id, thread_id, context)
+
+
+async def _h_show_stats(query, data, table, thread_id, context):
+    await send_table_stats(query.message.chat_id, thread_id, table, context)
+
+
+async def _h_show_board(query, data, table, thread_id, context):
+    # Board-Bild schicken und nach 25s wieder löschen (Preview)
+    await send_board_images_to_topic(
+        chat_id=query.message.chat_id,
+        table=table,
+        context=context,
+        explain=True,
+        auto_delete=True,
     )
 
-    if any(data.startswith(p) for p in host_only_prefixes):
-        # Falls noch kein Host gesetzt → dieser User wird Host
-        if table.host_id is None:
-            table.host_id = user.id
 
-        if user.id != table.host_id:
-            await query.message.reply_text(
-                "🚫 Only the table host can change the settings, maxi.\n"
-                "Democracy ends where poker begins."
-            )
-            return
+async def _h_setup_menu(query, data, table, thread_id, context):
+    await _edit_or_reply(
+        query,
+        "🎛 *Poker Session Setup*\n\n"
+        "Configure everything before starting the match:",
+        parse_mode="Markdown",
+        reply_markup=setup_menu_keyboard(),
+    )
 
-    # ---------------------------------------------------------
-    #  GENERISCHE MENÜ-BUTTONS
-    # ---------------------------------------------------------
 
-    if data == "back_main":
-        await query.message.reply_text(
-            "⬅ Back to main table menu.",
-            reply_markup=main_menu_keyboard(),
-        )
-        return
+async def _h_setup_help(query, data, table, thread_id, context):
+    await _edit_or_reply(
+        query,
+        "ℹ️ *Setup Guide*\n\n"
+        "• Chips = Starting stacks\n"
+        "• Rounds = Number of hands\n"
+        "• Players = Max seats\n",
+        parse_mode="Markdown",
+        reply_markup=_SETUP_BACK_KB,
+    )
 
-    if data == "show_rules":
-        await send_rules(msg.chat_id, thread_id, context)
-        return
 
-    if data == "show_leaderboard":
-        await send_leaderboard(msg.chat_id, thread_id, context)
-        return
+async def _h_reset_table(query, data, table, thread_id, context):
+    # Reset nur für dieses Topic, nicht fürs Leaderboard
+    key = (query.message.chat_id, thread_id)
+    if key in TABLES:
+        del TABLES[key]
+    await query.message.reply_text(
+        "♻ Table has been reset.\nUse /settable to start a new match."
+    )
 
-    if data == "show_stats":
-        await send_table_stats(msg.chat_id, thread_id, table, context)
-        return
 
-    if data == "show_board":
-        # Board-Bild schicken und nach 25s wieder löschen (Preview)
-        await send_board_images_to_topic(
-            chat_id=msg.chat_id,
-            table=table,
-            context=context,
-            explain=True,
-            auto_delete=True,
-        )
-        return
+async def _h_start_session(query, data, table, thread_id, context):
+    table.hands_played = 0  # Reset Hands-Zähler
 
-    # ---------------------------------------------------------
-    #  SETUP-MENÜ
-    # ---------------------------------------------------------
+    max_hands_txt = "∞ (free play)" if table.max_hands == 0 else f"{table.max_hands} hands"
+    max_players_txt = (
+        "unlimited" if table.max_players == 0 else f"{table.max_players} players"
+    )
 
-    if data == "setup_menu":
-        await query.message.reply_text(
-            "🎛 *Poker Session Setup*\n\n"
-            "Configure everything before starting the match:",
-            parse_mode="Markdown",
-            reply_markup=setup_menu_keyboard(),
-        )
+    await query.message.reply_text(
+        "🎬 *Poker Session is live!*\n\n"
+        f"Host: {query.from_user.mention_html()}\n\n"
+        "*Settings:*\n"
+        f"• Starting stack: {table.starting_chips} BMT\n"
+        f"• Hands: {max_hands_txt}\n"
+        f"• Seats: {max_players_txt}\n\n"
+        "Players: press *Join Table*.\n"
+        "Host: press *Start Hand* when players are ready.",
+        parse_mode="HTML",
+        reply_markup=_SESSION_KB,
+    )
+
+
+async def _h_join_table(query, data, table, thread_id, context):
+    user = query.from_user
+
+    # Schon am Tisch?
+    if user.id in table.players:
+        await query.message.reply_text("🪑 You're already seated at this table.")
         return
 
-    if data == "setup_help":
-        await query.message.reply_text(
-            "ℹ️ *Setup Guide*\n\n"
-            "• Chips = Starting stacks\n"
-            "• Rounds = Number of hands\n"
-            "• Players = Max seats\n",
-            parse_mode="Markdown",
-            reply_markup=InlineKeyboardMarkup(
-                [[InlineKeyboardButton("⬅ Back", callback_data="setup_menu")]]
-            ),
-        )
+    max_p = table.max_players
+    if max_p and len(table.players) >= max_p:
+        await query.message.reply_text("🚫 Table is full.")
         return
 
-    # ---------------------------------------------------------
-    #  RESET TABLE (nur dieses Topic, nicht Leaderboard)
-    # ---------------------------------------------------------
+    name = user.first_name or user.username or "Unnamed maxi"
+    table.add_player(user.id, name)
+    storage.ensure_player(user.id, name)
+    touch_player(table, table.players[user.id], asyncio.get_running_loop().time())
+
+    # Namen escapen: "_"/"<" in Telegram-Namen dürfen das HTML nicht brechen
+    players_txt = ", ".join(html.escape(p.name) for p in table.players.values())
 
-    if data == "reset_table":
-        key = (msg.chat_id, thread_id)
-        if key in TABLES:
-            del TABLES[key]
-        await query.message.reply_text(
-            "♻ Table has been reset.\nUse /settable to start a new match."
+    # Bestätigung mit Buttons
+    await query.message.reply_text(
+        f"💺 {user.mention_html()} joined the table.\n"
+        f"Players now: {players_txt}",
+        parse_mode="HTML",
+        reply_markup=_JOIN_START_KB,
+    )
+
+    # Chip-Bild
+    if CHIP_BYTES is not None:
+        m = await context.bot.send_photo(
+            chat_id=query.message.chat_id,
+            photo=_cached_media("chip", CHIP_BYTES, "chip.png"),
+            caption=f"💰 {name} sits down with {table.starting_chips} BMT.",
+            message_thread_id=thread_id,
         )
-        return
+        _remember_file_id("chip", m)
 
-    # ---------------------------------------------------------
-    #  START SESSION
-    # ---------------------------------------------------------
+    # „Who’s next?“ mit denselben Buttons
+    await context.bot.send_message(
+        chat_id=query.message.chat_id,
+        message_thread_id=thread_id,
+        text="Who’s next? Hit *Join Table*! 💺\nHost can hit *Start Hand* anytime.",
+        parse_mode="Markdown",
+        reply_markup=_JOIN_START_KB,
+    )
 
-    if data == "start_session":
-        table.hands_played = 0  # Reset Hands-Zähler
 
-        max_hands_txt = "∞ (free play)" if table.max_hands == 0 else f"{table.max_hands} hands"
-        max_players_txt = (
-            "unlimited" if table.max_players == 0 else f"{table.max_players} players"
-        )
+async def _h_cfg_chips(query, data, table, thread_id, context):
+    await _edit_or_reply(
+        query,
+        "⚙️ Starting chips:",
+        reply_markup=_CHIPS_KB,
+    )
 
-        session_kb = InlineKeyboardMarkup(
-            [
-                [InlineKeyboardButton("🧑‍💻 Join Table", callback_data="join_table")],
-                [InlineKeyboardButton("🎬 Start Hand", callback_data="start_hand")],
-            ]
-        )
 
-        await query.message.reply_text(
-            "🎬 *Poker Session is live!*\n\n"
-            f"Host: {user.mention_html()}\n\n"
-            "*Settings:*\n"
-            f"• Starting stack: {table.starting_chips} BMT\n"
-            f"• Hands: {max_hands_txt}\n"
-            f"• Seats: {max_players_txt}\n\n"
-            "Players: press *Join Table*.\n"
-            "Host: press *Start Hand* when players are ready.",
-            parse_mode="HTML",
-            reply_markup=session_kb,
+def _make_set_handler(attr, confirm):
+    """Ein Handler-Bauplan für alle drei set_*-Buttons.
+
+    Die Handler waren dreimal derselbe Code mit anderem Attribut und
+    Bestätigungstext – jetzt einmal: int(suffix), setattr, Bestätigung.
+    """
+
+    async def _h_set(query, suffix, table, thread_id, context):
+        value = int(suffix)
+        setattr(table, attr, value)
+        await _edit_or_reply(
+            query,
+            confirm(value),
+            reply_markup=setup_menu_keyboard(),
         )
-        return
 
-    # ---------------------------------------------------------
-    #  JOIN TABLE
-    # ---------------------------------------------------------
+    return _h_set
 
-    if data == "join_table":
-        # Schon am Tisch?
-        if user.id in table.players:
-            await query.message.reply_text("🪑 You're already seated at this table.")
-            return
 
-        max_p = getattr(table, "max_players", 0)
-        if max_p and len(table.players) >= max_p:
-            await query.message.reply_text("🚫 Table is full.")
-            return
+_h_set_chips = _make_set_handler(
+    "starting_chips", lambda v: f"✅ Starting stack set to {v} BMT."
+)
+_h_set_hands = _make_set_handler(
+    "max_hands", lambda v: f"✅ Hands set to {'∞' if v == 0 else v}."
+)
+_h_set_players = _make_set_handler(
+    "max_players", lambda v: f"✅ Max seats set to {v if v != 0 else 'unlimited'}."
+)
 
-        name = user.first_name or user.username or "Unnamed maxi"
-        table.add_player(user.id, name)
-        storage.ensure_player(user.id, name)
-        setattr(table.players[user.id], "last_action_time", now)
 
-        players_txt = ", ".join(p.name for p in table.players.values())
+async def _h_cfg_rounds(query, data, table, thread_id, context):
+    await _edit_or_reply(
+        query,
+        "🎯 Select number of hands:",
+        reply_markup=_ROUNDS_KB,
+    )
 
-        join_start_kb = InlineKeyboardMarkup(
-            [
-                [
-                    InlineKeyboardButton("🧑‍💻 Join Table", callback_data="join_table"),
-                    InlineKeyboardButton("🎬 Start Hand", callback_data="start_hand"),
-                ]
-            ]
-        )
 
-        # Bestätigung mit Buttons
-        await query.message.reply_text(
-            f"💺 {user.mention_html()} joined the table.\n"
-            f"Players now: {players_txt}",
-            parse_mode="HTML",
-            reply_markup=join_start_kb,
-        )
+async def _h_cfg_players(query, data, table, thread_id, context):
+    await _edit_or_reply(
+        query,
+        "👥 Select max seats:",
+        reply_markup=_PLAYERS_KB,
+    )
 
-        # Chip-Bild
-        if CHIP_PATH.exists():
-            with open(CHIP_PATH, "rb") as f:
-                await context.bot.send_photo(
-                    chat_id=msg.chat_id,
-                    photo=InputFile(f),
-                    caption=f"💰 {name} sits down with {table.starting_chips} BMT.",
-                    message_thread_id=thread_id,
-                )
 
-        # „Who’s next?“ mit denselben Buttons
-        await context.bot.send_message(
-            chat_id=msg.chat_id,
-            message_thread_id=thread_id,
-            text="Who’s next? Hit *Join Table*! 💺\nHost can hit *Start Hand* anytime.",
-            parse_mode="Markdown",
-            reply_markup=join_start_kb,
-        )
+async def _h_raise_menu(query, data, table, thread_id, context):
+    # Nur der aktuelle Spieler darf das Raise-Menü öffnen
+    user = query.from_user
+    current_id = table.current_player_id()
+    if current_id is None or current_id != user.id:
+        await query.message.reply_text("⏳ Not your turn.")
         return
 
-    # ---------------------------------------------------------
-    #  CHIP / ROUND / PLAYER CONFIG
-    # ---------------------------------------------------------
+    p = table.players.get(user.id)
+    stack_info = f"\n\nYou currently have *{p.chips}* BMT left." if p else ""
 
-    if data == "cfg_chips":
-        await query.message.reply_text(
-            "⚙️ Starting chips:",
-            reply_markup=InlineKeyboardMarkup(
-                [
-                    [
-                        InlineKeyboardButton("250000", callback_data="set_chips:250000"),
-                        InlineKeyboardButton("500000", callback_data="set_chips:500000"),
-                    ],
-                    [
-                        InlineKeyboardButton("1000000", callback_data="set_chips:1000000"),
-                        InlineKeyboardButton("2500000", callback_data="set_chips:2500000"),
-                    ],
-                    [InlineKeyboardButton("⬅ Back", callback_data="setup_menu")],
-                ]
-            ),
-        )
-        return
+    await _edit_or_reply(
+        query,
+        "🎯 *Select your raise amount:*" + stack_info,
+        parse_mode="Markdown",
+        reply_markup=build_raise_menu(),
+    )
 
-    if data.startswith("set_chips:"):
-        value = int(data.split(":", 1)[1])
-        table.starting_chips = value
-        await query.message.reply_text(
-            f"✅ Starting stack set to {value} BMT.",
-            reply_markup=setup_menu_keyboard(),
-        )
-        return
 
-    if data == "cfg_rounds":
-        await query.message.reply_text(
-            "🎯 Select number of hands:",
-            reply_markup=InlineKeyboardMarkup(
-                [
-                    [
-                        InlineKeyboardButton("5", callback_data="set_hands:5"),
-                        InlineKeyboardButton("10", callback_data="set_hands:10"),
-                    ],
-                    [
-                        InlineKeyboardButton("20", callback_data="set_hands:20"),
-                        InlineKeyboardButton("∞ Free Play", callback_data="set_hands:0"),
-                    ],
-                    [InlineKeyboardButton("⬅ Back", callback_data="setup_menu")],
-                ]
-            ),
-        )
+async def _h_back_actions(query, data, table, thread_id, context):
+    await _edit_or_reply(
+        query,
+        "➡ Back to actions.",
+        reply_markup=build_action_keyboard(),
+    )
+
+
+async def _h_raise_amt(query, amt, table, thread_id, context):
+    if amt.lower() in ALLIN_TOKENS:
+        await handle_action(query, table, "raise_allin", context)
         return
 
-    if data.startswith("set_hands:"):
-        value = int(data.split(":", 1)[1])
-        table.max_hands = value
-        await query.message.reply_text(
-            f"✅ Hands set to {'∞' if value == 0 else value}.",
-            reply_markup=setup_menu_keyboard(),
-        )
+    try:
+        value = int(amt)
+    except Exception:
+        await query.message.reply_text("❌ Invalid raise amount.")
         return
 
-    if data == "cfg_players":
-        await query.message.reply_text(
-            "👥 Select max seats:",
-            reply_markup=InlineKeyboardMarkup(
-                [
-                    [
-                        InlineKeyboardButton("2", callback_data="set_players:2"),
-                        InlineKeyboardButton("3", callback_data="set_players:3"),
-                        InlineKeyboardButton("4", callback_data="set_players:4"),
-                    ],
-                    [
-                        InlineKeyboardButton("6", callback_data="set_players:6"),
-                        InlineKeyboardButton("8", callback_data="set_players:8"),
-                        InlineKeyboardButton("Unlimited", callback_data="set_players:0"),
-                    ],
-                    [InlineKeyboardButton("⬅ Back", callback_data="setup_menu")],
-                ]
-            ),
-        )
+    await handle_action(query, table, f"raise_{value}", context)
+
+
+async def _h_raise_custom(query, data, table, thread_id, context):
+    context.user_data["awaiting_custom_raise"] = True
+    await query.message.reply_text(
+        "💬 Type your raise amount:\nExample: `150000`",
+        parse_mode="Markdown",
+    )
+
+
+async def _h_start_hand(query, data, table, thread_id, context):
+    await handle_start_hand(query, table, context)
+
+
+async def _h_act(query, action, table, thread_id, context):
+    user = query.from_user
+    if user.id not in table.players:
+        await query.message.reply_text("🚫 You're not seated.")
         return
 
-    if data.startswith("set_players:"):
-        value = int(data.split(":", 1)[1])
-        table.max_players = value
-        await query.message.reply_text(
-            f"✅ Max seats set to {value if value != 0 else 'unlimited'}.",
-            reply_markup=setup_menu_keyboard(),
-        )
+    current_id = table.current_player_id()
+    if current_id is not None and current_id != user.id:
+        await query.message.reply_text("⏳ Not your turn.")
         return
 
-    # ---------------------------------------------------------
-    #  RAISE-MENÜ + HANDLING
-    # ---------------------------------------------------------
+    await handle_action(query, table, action, context)
 
-    if data == "act:raise_menu":
-        # Nur der aktuelle Spieler darf das Raise-Menü öffnen
-        current_id = table.current_player_id()
-        if current_id is None or current_id != user.id:
-            await query.message.reply_text("⏳ Not your turn.")
-            return
 
-        p = table.players.get(user.id)
-        stack_info = f"\n\nYou currently have *{p.chips}* BMT left." if p else ""
+async def _h_view_round(query, data, table, thread_id, context):
+    # VIEW TABLE (Video mit Auto-Delete)
+    msg_obj = None
 
-        await query.message.reply_text(
-            "🎯 *Select your raise amount:*" + stack_info,
-            parse_mode="Markdown",
-            reply_markup=build_raise_menu(),
+    if TABLE_VIEW_VIDEO_BYTES is not None:
+        msg_obj = await context.bot.send_video(
+            chat_id=query.message.chat_id,
+            video=_cached_media("table_view_video", TABLE_VIEW_VIDEO_BYTES, "table_view.mp4"),
+            caption="👀 A quick look at the chaos...",
+            message_thread_id=thread_id,
         )
-        return
-
-    if data == "back_actions":
-        await query.message.reply_text(
-            "➡ Back to actions.",
-            reply_markup=build_action_keyboard(),
+        _remember_file_id("table_view_video", msg_obj)
+    elif TABLE_VIEW_IMAGE_BYTES is not None:
+        msg_obj = await context.bot.send_photo(
+            chat_id=query.message.chat_id,
+            photo=_cached_media("table_view_image", TABLE_VIEW_IMAGE_BYTES, "table_view.png"),
+            caption="👀 A quick look at the chaos...",
+            message_thread_id=thread_id,
         )
-        return
+        _remember_file_id("table_view_image", msg_obj)
+
+    if msg_obj:
+        schedule_delete(query.message.chat_id, msg_obj.message_id, delay=25)
+
+
+# Exakte callback_data → Handler. "act:raise_menu" steht bewusst hier,
+# damit es vor dem generischen "act:"-Präfix gewinnt.
+EXACT_HANDLERS = {
+    "back_main": _h_back_main,
+    "show_rules": _h_show_rules,
+    "show_leaderboard": _h_show_leaderboard,
+    "show_stats": _h_show_stats,
+    "show_board": _h_show_board,
+    "setup_menu": _h_setup_menu,
+    "setup_help": _h_setup_help,
+    "reset_table": _h_reset_table,
+    "start_session": _h_start_session,
+    "join_table": _h_join_table,
+    "cfg_chips": _h_cfg_chips,
+    "cfg_rounds": _h_cfg_rounds,
+    "cfg_players": _h_cfg_players,
+    "act:raise_menu": _h_raise_menu,
+    "back_actions": _h_back_actions,
+    "raise_custom": _h_raise_custom,
+    "start_hand": _h_start_hand,
+    "view_round": _h_view_round,
+}
 
-    if data.startswith("raiseamt:"):
-        amt = data.split(":", 1)[1]
+# Präfix-Tabelle nur für die parametrisierten Buttons; wird erst
+# probiert, wenn der exakte Lookup nichts trifft. Die Länge steht
+# direkt daneben, damit der Dispatcher den Suffix mit einem Slice
+# abtrennen kann (kein split() + Listen-Alloc pro Klick).
+PREFIX_HANDLERS = tuple(
+    (prefix, len(prefix), handler)
+    for prefix, handler in (
+        ("set_chips:", _h_set_chips),
+        ("set_hands:", _h_set_hands),
+        ("set_players:", _h_set_players),
+        ("raiseamt:", _h_raise_amt),
+        ("act:", _h_act),
+    )
+)
 
-        if amt.lower() in ("all", "allin", "all-in"):
-            await handle_action(query, table, "raise_allin", context)
-            return
+HOST_ONLY = frozenset(
+    {
+        "cfg_chips",
+        "cfg_rounds",
+        "cfg_players",
+        "reset_table",
+        "setup_menu",
+        "setup_help",
+        "start_session",
+        "start_hand",
+    }
+)
+HOST_ONLY_PREFIXES = ("set_chips:", "set_hands:", "set_players:")
 
-        try:
-            value = int(amt)
-        except Exception:
-            await query.message.reply_text("❌ Invalid raise amount.")
-            return
 
-        await handle_action(query, table, f"raise_{value}", context)
-        return
+async def _safe_answer(query):
+    # CallbackQuery kann "zu alt" sein → sauber abfangen
+    try:
+        await query.answer()
+    except BadRequest:
+        # Query zu alt / schon beantwortet – ignorieren
+        pass
 
-    if data == "raise_custom":
-        context.user_data["awaiting_custom_raise"] = True
-        await query.message.reply_text(
-            "💬 Type your raise amount:\nExample: `150000`",
-            parse_mode="Markdown",
-        )
-        return
+
+async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    data = query.data
+    user = query.from_user
+    msg = query.message
+
+    # ACK als Task: der Roundtrip zu Telegram läuft parallel zur
+    # eigentlichen Antwort statt davor (spart ~1 RTT pro Klick).
+    context.application.create_task(_safe_answer(query))
 
     # ---------------------------------------------------------
-    #  START HAND
+    #  TABLE HOLEN
     # ---------------------------------------------------------
+    table = get_table(update, create=True)
+    thread_id = msg.message_thread_id
 
-    if data == "start_hand":
-        await handle_start_hand(query, table, context)
-        return
+    # AFK-Timestamp für aktive Spieler aktualisieren
+    # (ein .get statt "in" + Index: halb so viele Dict-Lookups pro Klick)
+    now = asyncio.get_running_loop().time()
+    p = table.players.get(user.id)
+    if p is not None:
+        touch_player(table, p, now)
 
     # ---------------------------------------------------------
-    #  ACTIONS: CALL / RAISE / FOLD
+    #  HOST-CHECK
     # ---------------------------------------------------------
+    if data in HOST_ONLY or data.startswith(HOST_ONLY_PREFIXES):
+        # Falls noch kein Host gesetzt → dieser User wird Host
+        if table.host_id is None:
+            table.host_id = user.id
 
-    if data.startswith("act:"):
-        if user.id not in table.players:
-            await query.message.reply_text("🚫 You're not seated.")
-            return
-
-        current_id = table.current_player_id()
-        if current_id is not None and current_id != user.id:
-            await query.message.reply_text("⏳ Not your turn.")
+        if user.id != table.host_id:
+            await query.message.reply_text(
+                "🚫 Only the table host can change the settings, maxi.\n"
+                "Democracy ends where poker begins."
+            )
             return
 
-        action = data.split(":", 1)[1]
-        await handle_action(query, table, action, context)
-        return
-
     # ---------------------------------------------------------
-    #  VIEW TABLE (VIDEO mit Auto-Delete)
+    #  DISPATCH
     # ---------------------------------------------------------
+    handler = EXACT_HANDLERS.get(data)
+    if handler is not None:
+        await handler(query, data, table, thread_id, context)
+        return
 
-    if data == "view_round":
-        msg_obj = None
-
-        if TABLE_VIEW_VIDEO_PATH.exists():
-            with open(TABLE_VIEW_VIDEO_PATH, "rb") as vid:
-                msg_obj = await context.bot.send_video(
-                    chat_id=msg.chat_id,
-                    video=InputFile(vid),
-                    caption="👀 A quick look at the chaos...",
-                    message_thread_id=thread_id,
-                )
-        elif TABLE_VIEW_IMAGE.exists():
-            with open(TABLE_VIEW_IMAGE, "rb") as f:
-                msg_obj = await context.bot.send_photo(
-                    chat_id=msg.chat_id,
-                    photo=InputFile(f),
-                    caption="👀 A quick look at the chaos...",
-                    message_thread_id=thread_id,
-                )
+    for prefix, plen, h in PREFIX_HANDLERS:
+        if data.startswith(prefix):
+            # Suffix einmal hier slicen; die Handler parsen nicht selbst
+            await h(query, data[plen:], table, thread_id, context)
+            return
 
-        if msg_obj and context.application:
-            context.application.create_task(
-                auto_delete_message(context, msg.chat_id, msg_obj.message_id, delay=25)
-            )
-        return
 # ============== GAME FLOW HELPERS ==============
 
 async def handle_start_hand(query, table: Table, context: ContextTypes.DEFAULT_TYPE):
@@ -1042,42 +1296,53 @@ async def handle_start_hand(query, table: Table, context: ContextTypes.DEFAULT_T
         table.deal_hole_cards()
 
         # AFK-Status für alle Spieler zurücksetzen
-        now = asyncio.get_event_loop().time()
+        now = asyncio.get_running_loop().time()
         for pl in table.players.values():
-            pl.last_action_time = now
-            pl.afk_warned = False
-
-        # Hole Cards an User senden (sofern möglich)
-        for p in table.players.values():
-            if len(p.hole_cards) != 2:
-                continue
+            touch_player(table, pl, now)
 
+        # Hole Cards an alle User parallel senden: N DMs kosten so eine
+        # Telegram-RTT statt N nacheinander.
+        async def _dm_hole_cards(pl):
             try:
                 # Direkt user_id als chat_id nutzen
-                await send_card_images_to_player(p.user_id, p.hole_cards, context)
+                await send_card_images_to_player(pl.user_id, pl.hole_cards, context)
             except Forbidden:
                 # Spieler hat Bot nie privat gestartet → Hinweis in der Gruppe
-                try:
-                    await context.bot.send_message(
-                        chat_id=chat_id,
-                        message_thread_id=table.thread_id,
-                        text=(
-                            f"⚠️ {p.name}, I can't DM you your cards.\n"
-                            "Please open a private chat with me and send /start first."
-                        ),
-                    )
-                except Exception:
-                    pass
+                return pl
             except Exception:
                 # Sonstige Fehler ignorieren, Hand trotzdem weiterlaufen lassen
                 pass
+            return None
+
+        failed = await asyncio.gather(
+            *(
+                _dm_hole_cards(p)
+                for p in table.players.values()
+                if len(p.hole_cards) == 2
+            )
+        )
+        for p in failed:
+            if p is None:
+                continue
+            try:
+                await context.bot.send_message(
+                    chat_id=chat_id,
+                    message_thread_id=table.thread_id,
+                    text=(
+                        f"⚠️ {p.name}, I can't DM you your cards.\n"
+                        "Please open a private chat with me and send /start first."
+                    ),
+                )
+            except Exception:
+                pass
 
         total_hands = "∞" if table.max_hands == 0 else str(table.max_hands)
 
         # Aktuellen Spieler bestimmen
         first_id = table.current_player_id()
-        if first_id is not None and first_id in table.players:
-            first_name = table.players[first_id].name
+        first_player = table.players.get(first_id) if first_id is not None else None
+        if first_player is not None:
+            first_name = html.escape(first_player.name)
             next_line = (
                 f"➡ First to act: {first_name}\n"
                 f"{first_name}, try not to punt your whole stack on the very first click. 💧"
@@ -1086,8 +1351,8 @@ async def handle_start_hand(query, table: Table, context: ContextTypes.DEFAULT_T
             next_line = "➡ First to act: unknown chaos."
 
         text = (
-            "🃏 *New hand started!*\n"
-            f"Hand: *{table.hands_played}/{total_hands}*\n"
+            "🃏 <b>New hand started!</b>\n"
+            f"Hand: <b>{table.hands_played}/{total_hands}</b>\n"
             f"Players seated: {len(table.players)}\n"
             "Hole cards have been sent privately (for humans that DM'd me).\n\n"
             "The Tears are cold, the maxis are bold – have fun and good luck. 🍀💧\n\n"
@@ -1097,14 +1362,14 @@ async def handle_start_hand(query, table: Table, context: ContextTypes.DEFAULT_T
         kb = build_action_keyboard()
 
         # Optional: Chip-Bild posten (wenn vorhanden)
-        if CHIP_PATH.exists():
+        if CHIP_BYTES is not None:
             try:
-                with open(CHIP_PATH, "rb") as f:
-                    await query.message.reply_photo(
-                        InputFile(f),
-                        caption="💰 Fresh stack, fresh pain incoming.",
-                        message_thread_id=table.thread_id,
-                    )
+                m = await query.message.reply_photo(
+                    _cached_media("chip", CHIP_BYTES, "chip.png"),
+                    caption="💰 Fresh stack, fresh pain incoming.",
+                    message_thread_id=table.thread_id,
+                )
+                _remember_file_id("chip", m)
             except Exception:
                 # Nur kosmetisch, kein Grund abzubrechen
                 pass
@@ -1114,7 +1379,7 @@ async def handle_start_hand(query, table: Table, context: ContextTypes.DEFAULT_T
             chat_id=chat_id,
             text=text,
             reply_markup=kb,
-            parse_mode="Markdown",      # nur statische Teile sind fett, keine Usernamen
+            parse_mode="HTML",      # Namen sind escaped, fett nur die statischen Teile
             message_thread_id=table.thread_id,
         )
 
@@ -1143,7 +1408,7 @@ async def handle_action(query, table: Table, action: str, context: ContextTypes.
             return
 
         # Spieler ist bereits gefoldet → darf nichts mehr machen
-        if getattr(p, "folded", False):
+        if p.folded:
             await query.message.reply_text(
                 "🏳️ You're already folded.\n"
                 "Grab some popcorn and wait for the next hand."
@@ -1165,9 +1430,8 @@ async def handle_action(query, table: Table, action: str, context: ContextTypes.
             )
             return
 
-        now = asyncio.get_event_loop().time()
-        p.last_action_time = now
-        p.afk_warned = False  # sie haben gerade agiert → Warnung zurücksetzen
+        now = asyncio.get_running_loop().time()
+        touch_player(table, p, now)  # sie haben gerade agiert → Timer neu
 
         log_lines: List[str] = []
         pre_stage = table.stage
@@ -1192,7 +1456,7 @@ async def handle_action(query, table: Table, action: str, context: ContextTypes.
             elif action.startswith("raise_"):
                 raw = action.split("_", 1)[1].lower()
 
-                if raw in ("all", "allin", "all-in"):
+                if raw in ALLIN_TOKENS:
                     amount = p.chips
                 else:
                     try:
@@ -1224,8 +1488,9 @@ async def handle_action(query, table: Table, action: str, context: ContextTypes.
         table.advance_stage_if_needed()
 
         # ========= AUTO-ADVANCE WENN KEIN NÄCHSTER SPIELER / ALLE ALL-IN =========
-        active_players = [pl for pl in table.players.values() if not pl.folded]
-        all_allin_or_broke = bool(active_players) and all(pl.chips <= 0 for pl in active_players)
+        # Die Street-Zähler wissen das schon: aktiv, aber niemand mehr
+        # mit Chips -> alle all-in/broke. Kein Listen-Scan pro Klick.
+        all_allin_or_broke = table.n_active > 0 and table.n_betting == 0
         no_next_player = table.current_player_id() is None
 
         if all_allin_or_broke or no_next_player:
@@ -1271,13 +1536,11 @@ async def handle_action(query, table: Table, action: str, context: ContextTypes.
         if table.stage == Stage.SHOWDOWN:
             text, markup = await handle_showdown_and_build_text(table, context, query)
         else:
-            community = ", ".join(table.community_cards) if table.community_cards else "—"
+            community = board_text(table)
             next_id = table.current_player_id()
 
-            if next_id is not None and next_id in table.players:
-                next_name = table.players[next_id].name
-            else:
-                next_name = "unknown chaos"
+            next_player = table.players.get(next_id) if next_id is not None else None
+            next_name = next_player.name if next_player is not None else "unknown chaos"
 
             log_text = "\n".join(log_lines) if log_lines else "…nothing happened?"
 
@@ -1308,22 +1571,6 @@ async def handle_action(query, table: Table, action: str, context: ContextTypes.
 
 # ======== HAND EVALUATION HELPERS (Texas Hold'em) ========
 
-CARD_RANKS = {
-    "2": 2,
-    "3": 3,
-    "4": 4,
-    "5": 5,
-    "6": 6,
-    "7": 7,
-    "8": 8,
-    "9": 9,
-    "10": 10,
-    "J": 11,
-    "Q": 12,
-    "K": 13,
-    "A": 14,
-}
-
 RANK_NAMES = {
     2: "2",
     3: "3",
@@ -1341,25 +1588,32 @@ RANK_NAMES = {
 }
 
 
-def parse_card(code: str) -> tuple[int, str]:
-    code = code.strip().upper()
-    if len(code) == 3:
-        rank_str = code[:2]
-        suit = code[2]
-    else:
-        rank_str = code[0]
-        suit = code[1]
-    return CARD_RANKS[rank_str], suit
+# Die zehn möglichen Straight-Masken als Konstante: eine 5-Karten-Hand
+# ist genau dann eine Straße, wenn ihre 13-Bit-Rangmaske exakt einem
+# dieser Werte entspricht – ein Dict-Get statt Shift-AND-Kaskade.
+STRAIGHT_MASKS: dict[int, int] = {0b11111 << i: i + 6 for i in range(9)}
+STRAIGHT_MASKS[0b1000000001111] = 5  # Wheel A-2-3-4-5
 
 
-def detect_straight(ranks: list[int]) -> Optional[int]:
-    if len(ranks) < 5:
+def _straight_high(rank_mask: int) -> Optional[int]:
+    """13-Bit-Rangmaske (Bit 0 = Zwei ... Bit 12 = Ass) -> Straight-High.
+
+    Das Ass wird zusätzlich unten eingespiegelt (Wheel A-2-3-4-5), dann
+    findet ein Shift-AND jede Fünferkette ohne Sortieren oder Sets:
+    Bit p im Ergebnis heißt "Straße bis Rang p+5".
+    """
+    m = (rank_mask << 1) | (rank_mask >> 12)
+    t = m & (m >> 1) & (m >> 2) & (m >> 3) & (m >> 4)
+    if not t:
         return None
-    if ranks[0] - ranks[-1] == 4 and len(set(ranks)) == 5:
-        return ranks[0]
-    if set(ranks) == {14, 5, 4, 3, 2}:
-        return 5
-    return None
+    return t.bit_length() + 4
+
+
+def detect_straight(ranks: list[int]) -> Optional[int]:
+    mask = 0
+    for r in ranks:
+        mask |= 1 << (r - 2)
+    return _straight_high(mask)
 
 
 def describe_hand(category: int, ranks_by_count: list[tuple[int, int]],
@@ -1393,39 +1647,91 @@ def describe_hand(category: int, ranks_by_count: list[tuple[int, int]],
     return f"high card {RANK_NAMES[high_rank]}"
 
 
-def evaluate_5card_hand(cards: list[str]) -> tuple[int, tuple, str]:
+# Lookup-Tabelle im Stil der Two-Plus-Two-Evaluatoren, nur in klein:
+# das Produkt der Rang-Primzahlen identifiziert die Rang-Multimenge einer
+# 5-Karten-Hand eindeutig, und zusammen mit dem Flush-Flag bestimmt sie
+# Kategorie, Tiebreak-Key und Beschreibung vollständig. Die Tabelle füllt
+# sich beim Spielen selbst (maximal 6188 Rang-Multimengen × 2) und macht
+# jede wiederholte Auswertung zu einem einzigen Dict-Lookup.
+_EVAL5_TABLE: dict[int, tuple[int, tuple, str]] = {}
+
+# Parallel dazu derselbe Key -> gepackter int-Score: Kategorie oben,
+# darunter bis zu fünf Rang-Nibbles. Der Showdown vergleicht damit
+# einen einzigen int statt (Kategorie, Tupel) elementweise zu laufen.
+_SCORE5_TABLE: dict[int, int] = {}
+
+
+def _pack_score(cat: int, key: tuple) -> int:
+    """(Kategorie, Tiebreak-Tupel) -> ein einziger vergleichbarer int.
+
+    Innerhalb einer Kategorie haben die Keys feste Länge, daher bleibt
+    die Ordnung beim Nibble-Packen exakt erhalten.
+    """
+    score = cat
+    for r in key:
+        score = (score << 4) | r
+    return score << (4 * (5 - len(key)))
+
+
+def evaluate_5card_hand(
+    cards: list[int],
+    # Default-Args binden Tabelle + Methode einmal: LOAD_FAST statt
+    # LOAD_GLOBAL + Methoden-Lookup bei jedem der 21 Combo-Aufrufe.
+    _get=_EVAL5_TABLE.get,
+    _table=_EVAL5_TABLE,
+) -> tuple[int, tuple, str]:
+    c0, c1, c2, c3, c4 = cards
+    prime_product = (
+        (c0 & 0x3F) * (c1 & 0x3F) * (c2 & 0x3F) * (c3 & 0x3F) * (c4 & 0x3F)
+    )
+    # alle Suit-Bits gleich <=> AND der Karten behält ein Suit-Bit
+    is_flush = (c0 & c1 & c2 & c3 & c4 & 0xF000) != 0
+
+    table_key = (prime_product << 1) | is_flush
+    result = _get(table_key)
+    if result is None:
+        result = _evaluate_5card_uncached(cards)
+        _table[table_key] = result
+        _SCORE5_TABLE[table_key] = _pack_score(result[0], result[1])
+    return result
+
+
+def _evaluate_5card_uncached(cards: list[int]) -> tuple[int, tuple, str]:
+    # Ein Durchlauf über die Karten: Rangliste, 13-Bit-Präsenzmaske und
+    # die Zählungen als Nibbles in einem int (Rang r -> Bits 4*(r-2)).
+    # Kein Counter, kein Dict – nur Shifts und Adds.
     ranks = []
-    suits = []
+    rank_mask = 0
+    counts64 = 0
     for c in cards:
-        r, s = parse_card(c)
+        r = ((c >> 8) & 0xF) + 2
         ranks.append(r)
-        suits.append(s)
+        rank_mask |= 1 << (r - 2)
+        counts64 += 1 << (4 * (r - 2))
 
     ranks_sorted = sorted(ranks, reverse=True)
-    unique_ranks_desc = sorted(set(ranks), reverse=True)
 
-    suit_counts = {}
-    for s in suits:
-        suit_counts[s] = suit_counts.get(s, 0) + 1
-    is_flush = len(suit_counts) == 1
-    flush_high = max(ranks_sorted) if is_flush else None
+    # alle Suit-Bits gleich <=> AND der Karten behält ein Suit-Bit
+    is_flush = (cards[0] & cards[1] & cards[2] & cards[3] & cards[4] & 0xF000) != 0
+    flush_high = ranks_sorted[0] if is_flush else None
 
-    straight_high = detect_straight(unique_ranks_desc)
+    straight_high = STRAIGHT_MASKS.get(rank_mask)
     is_straight = straight_high is not None
 
-    count_by_rank = {}
-    for r in ranks:
-        count_by_rank[r] = count_by_rank.get(r, 0) + 1
-
-    ranks_by_count = sorted(
-        count_by_rank.items(),
-        key=lambda x: (x[1], x[0]),
-        reverse=True,
-    )
-
-    counts = sorted(count_by_rank.values(), reverse=True)
-
-    if is_straight and is_flush and straight_high == 14 and min(ranks_sorted) >= 10:
+    # Nibbles entlang der gesetzten Rang-Bits dekodieren; maximal fünf
+    # Paare, danach einmal absteigend nach (Anzahl, Rang) sortieren.
+    pairs = []
+    m = rank_mask
+    while m:
+        b = m & -m
+        m ^= b
+        idx = b.bit_length() - 1
+        pairs.append(((counts64 >> (4 * idx)) & 0xF, idx + 2))
+    pairs.sort(reverse=True)
+    ranks_by_count = [(r, n) for n, r in pairs]
+    counts = [n for n, _ in pairs]
+
+    if is_straight and is_flush and straight_high == 14:
         category = 9
         key = (9,)
         desc = describe_hand(category, ranks_by_count, straight_high, flush_high)
@@ -1497,22 +1803,206 @@ def evaluate_5card_hand(cards: list[str]) -> tuple[int, tuple, str]:
     return category, key, desc
 
 
-def evaluate_best_hand(board: list[str], hole: list[str]) -> tuple[int, tuple, str, list[str]]:
+def _combos5(cards):
+    """combinations(cards, 5) von Hand mit Fast-Path rechts.
+
+    Im Normalfall muss nur der letzte Index hochgezählt werden; der
+    volle "welches Rad dreht sich"-Scan läuft erst, wenn er gesättigt
+    ist (der gh-113876-Trick, hier für k=5 komplett ausgerollt). n ist
+    bei uns 5-7 Karten, je nachdem ob der Flush-Prepass gefiltert hat.
+    """
+    n = len(cards)
+    if n == 5:
+        yield tuple(cards)
+        return
+    i0, i1, i2, i3, i4 = 0, 1, 2, 3, 4
+    last = n - 1
+    while True:
+        yield (cards[i0], cards[i1], cards[i2], cards[i3], cards[i4])
+        if i4 < last:
+            i4 += 1
+            continue
+        if i3 < n - 2:
+            i3 += 1
+            i4 = i3 + 1
+        elif i2 < n - 3:
+            i2 += 1
+            i3 = i2 + 1
+            i4 = i3 + 1
+        elif i1 < n - 4:
+            i1 += 1
+            i2 = i1 + 1
+            i3 = i2 + 1
+            i4 = i3 + 1
+        elif i0 < n - 5:
+            i0 += 1
+            i1 = i0 + 1
+            i2 = i1 + 1
+            i3 = i2 + 1
+            i4 = i3 + 1
+        else:
+            return
+
+
+def _prefill_eval5_table() -> None:
+    """Füllt die Rang-Tabelle komplett beim Import statt lazy im Spiel.
+
+    6175 Nicht-Flush-Multimengen plus 1287 Flush-Ranglagen, einmalig ein
+    paar Dutzend Millisekunden beim Start – dafür ist danach jeder
+    Showdown-Lookup garantiert ein Treffer und der erste große Pot hat
+    keinen Miss-Jitter mehr.
+    """
+    from game import CODE_TO_CARD
+
+    rank_str = {11: "J", 12: "Q", 13: "K", 14: "A"}
+    suits = ("S", "H", "D", "C")
+
+    def card(rank: int, suit: str) -> int:
+        return CODE_TO_CARD[f"{rank_str.get(rank, rank)}{suit}"]
+
+    for combo in itertools.combinations_with_replacement(range(2, 15), 5):
+        seen: dict = {}
+        suit_idx = []
+        for r in combo:
+            n = seen.get(r, 0)
+            seen[r] = n + 1
+            suit_idx.append(n)
+        if len(seen) < 2:
+            # fünf gleiche Ränge gibt es im Deck nicht
+            continue
+        # Bei lauter verschiedenen Rängen bekäme sonst jede Karte Suit 0
+        # -> versehentlicher Flush; eine Karte umfärben reicht.
+        if len(seen) == 5:
+            suit_idx[-1] = 1
+        evaluate_5card_hand([card(r, suits[s]) for r, s in zip(combo, suit_idx)])
+        # Flush-Variante existiert nur bei 5 verschiedenen Rängen
+        if len(seen) == 5:
+            evaluate_5card_hand([card(r, "S") for r in combo])
+
+
+_prefill_eval5_table()
+
+
+def _gen_best7_unrolled():
+    """Generiert die ausgerollte 21-Combo-Variante für genau 7 Karten.
+
+    Statt Generator + Schleife werden die 21 Fünfer-Kombinationen als
+    Quelltext ausgerollt (partielle Auswertung des k=5/n=7-Spezialfalls):
+    keine Iterator-Frames, keine Tupel-Erzeugung pro Combo, nur int-Ops
+    und Dict-Zugriffe in gerader Linie. Der direkte Tabellen-Index (statt
+    .get) ist sicher, weil _prefill_eval5_table() oben bereits alle 7462
+    Handklassen eingetragen hat.
+    """
+    lines = ["def _best7_unrolled(cards, _scores=_SCORE5_TABLE):"]
+    lines.append("    c0, c1, c2, c3, c4, c5, c6 = cards")
+    for i in range(7):
+        lines.append(f"    p{i} = c{i} & 0x3F")
+    lines.append("    best = -1")
+    lines.append("    best_key = -1")
+    lines.append("    best_combo = ()")
+    for i, j, k, l, m in itertools.combinations(range(7), 5):
+        lines.append(
+            f"    t = ((p{i} * p{j} * p{k} * p{l} * p{m}) << 1)"
+            f" | ((c{i} & c{j} & c{k} & c{l} & c{m} & 0xF000) != 0)"
+        )
+        lines.append("    s = _scores[t]")
+        lines.append("    if s > best:")
+        lines.append("        best = s")
+        lines.append("        best_key = t")
+        lines.append(f"        best_combo = (c{i}, c{j}, c{k}, c{l}, c{m})")
+    lines.append("    return best, best_key, best_combo")
+    namespace = {"_SCORE5_TABLE": _SCORE5_TABLE}
+    exec("\n".join(lines), namespace)
+    return namespace["_best7_unrolled"]
+
+
+_best7_unrolled = _gen_best7_unrolled()
+
+
+def score_best_hand(board: list[int], hole: list[int]) -> tuple[int, int, tuple]:
+    """Score-only-Pfad: packed Score + Tabellen-Key + Gewinner-Combo.
+
+    Die 21 Kombinationen laufen direkt gegen die Prime-Produkt-Tabelle
+    (unser kleiner Two-Plus-Two-Verschnitt): pro Combo fünf AND/MULs und
+    ein Dict-Get, kein Funktionsaufruf und keine Wegwerf-Liste. Nur ein
+    Tabellen-Miss fällt in den langsamen Pfad. Kategorie/Beschreibung
+    werden hier bewusst NICHT aufgelöst – im Showdown interessiert das
+    nur für den einen Gewinner (siehe evaluate_best_hand).
+    """
     all_cards = board + hole
-    best_cat = -1
-    best_key: tuple = ()
-    best_desc = ""
-    best_combo: list[str] = []
 
-    for combo in itertools.combinations(all_cards, 5):
-        cat, key, desc = evaluate_5card_hand(list(combo))
-        if (cat, key) > (best_cat, best_key):
-            best_cat = cat
-            best_key = key
-            best_desc = desc
-            best_combo = list(combo)
+    # Bit-paralleler 7-Karten-Prepass: pro Farbe eine 13-Bit-Rangmaske in
+    # einem Durchlauf. Hat eine Farbe >= 5 Karten, liegt die beste Hand
+    # garantiert komplett in dieser Farbe (Quads oder Full House daneben
+    # bräuchten 8 Karten) – dann reichen die Flush-Combos statt aller 21.
+    suit_masks = {0x8000: 0, 0x4000: 0, 0x2000: 0, 0x1000: 0}
+    for c in all_cards:
+        suit_masks[c & 0xF000] |= 1 << ((c >> 8) & 0xF)
+    for suit_bit, m in suit_masks.items():
+        if m.bit_count() >= 5:
+            all_cards = [c for c in all_cards if c & suit_bit]
+            break
+
+    return _best7_kernel(all_cards)
 
-    return best_cat, best_key, best_desc, best_combo
+
+def evaluate_best_hand(board: list[int], hole: list[int]) -> tuple[int, tuple, str, list[int]]:
+    """Beste 5er-Hand aus 7 Karten inkl. aufgelöster Beschreibung."""
+    _score, table_key, combo = score_best_hand(board, hole)
+    cat, key, desc = _EVAL5_TABLE[table_key]
+    return cat, key, desc, list(combo)
+
+
+def _best7_kernel(all_cards: list[int]) -> tuple[int, int, tuple]:
+    """Scored alle 5er-Combos eines Spielers in einem Rutsch.
+
+    Reine int-Arithmetik + Dict-Gets, keine Zwischenobjekte: pro Spieler
+    ein Aufruf, zurück kommen (Packed-Score, Tabellen-Key, Combo) des
+    Maximums. Dekodieren (Beschreibung etc.) passiert erst außerhalb und
+    nur für die Hand, die es auch anzeigt.
+    """
+    # Häufigster Fall (kein Flush-Prepass-Filter): die generierte,
+    # komplett ausgerollte 21-Combo-Variante ohne Schleifen-Overhead.
+    if len(all_cards) == 7:
+        return _best7_unrolled(all_cards)
+
+    best_score = -1
+    best_table_key = -1
+    best_combo: tuple = ()
+
+    scores = _SCORE5_TABLE
+    for combo in _combos5(all_cards):
+        c0, c1, c2, c3, c4 = combo
+        table_key = (
+            ((c0 & 0x3F) * (c1 & 0x3F) * (c2 & 0x3F) * (c3 & 0x3F) * (c4 & 0x3F)) << 1
+        ) | ((c0 & c1 & c2 & c3 & c4 & 0xF000) != 0)
+        score = scores.get(table_key)
+        if score is None:
+            result = _evaluate_5card_uncached(list(combo))
+            _EVAL5_TABLE[table_key] = result
+            score = _pack_score(result[0], result[1])
+            scores[table_key] = score
+        if score > best_score:
+            best_score = score
+            best_table_key = table_key
+            best_combo = combo
+
+    return best_score, best_table_key, best_combo
+
+
+def _score_all(board: list[int], active: list) -> list[tuple]:
+    """Synchroner Scoring-Block für den Showdown (läuft via to_thread)."""
+    best_results = []
+    for p in active:
+        if not p.hole_cards or len(board) < 5:
+            best_results.append((-1, p, None, ()))
+            continue
+
+        # Score-only: der packed int reicht zum Vergleichen, Beschreibung
+        # und Karten-Liste werden nur für den Gewinner aufgelöst.
+        score, table_key, combo = score_best_hand(board, p.hole_cards)
+        best_results.append((score, p, table_key, combo))
+    return best_results
 
 
 async def handle_showdown_and_build_text(table: Table, context: ContextTypes.DEFAULT_TYPE, query):
@@ -1524,40 +2014,33 @@ async def handle_showdown_and_build_text(table: Table, context: ContextTypes.DEF
             "Somehow everyone folded? The pot has vanished into the void.\n"
             "Perfectly decentralized Tears."
         )
-        markup = InlineKeyboardMarkup(
-            [
-                [InlineKeyboardButton("🎬 New Hand", callback_data="start_hand")],
-                [
-                    InlineKeyboardButton("🏆 Leaderboard", callback_data="show_leaderboard"),
-                    InlineKeyboardButton("📊 Table Stats", callback_data="show_stats"),
-                ],
-            ]
-        )
-        return text, markup
+        return text, _SHOWDOWN_KB
 
     board = table.community_cards
-    best_results = []
-
-    for p in active:
-        if not p.hole_cards or len(board) < 5:
-            best_results.append((-1, (), p, "mysterious non-hand", []))
-            continue
-
-        cat, key, desc, best5 = evaluate_best_hand(board, p.hole_cards)
-        best_results.append((cat, key, p, desc, best5))
+    # CPU-Arbeit (21 Combos pro Spieler) raus aus dem Event-Loop, damit
+    # parallel laufende Tische ihre Callbacks weiter bedient bekommen.
+    best_results = await asyncio.to_thread(_score_all, board, active)
 
-    best_results.sort(key=lambda x: (x[0], x[1]), reverse=True)
-    winner_cat, winner_key, winner, winner_desc, winner_best5 = best_results[0]
+    # Nur der Gewinner interessiert: max() in O(n) statt Vollsortierung
+    _winner_score, winner, winner_key, winner_combo = max(
+        best_results, key=lambda x: x[0]
+    )
+    if winner_key is not None:
+        _cat, _key, winner_desc = _EVAL5_TABLE[winner_key]
+        winner_best5 = list(winner_combo)
+    else:
+        winner_desc, winner_best5 = "mysterious non-hand", []
 
     winner.chips += table.pot
 
-    storage.record_hand_result(winner.user_id, table.pot, True)
-    for p in table.players.values():
-        if p.user_id != winner.user_id:
-            storage.record_hand_result(p.user_id, 0, False)
+    storage.record_showdown(
+        winner.user_id,
+        table.pot,
+        [p.user_id for p in table.players.values() if p.user_id != winner.user_id],
+    )
 
-    community = ", ".join(table.community_cards) if table.community_cards else "—"
-    winning_cards_txt = ", ".join(winner_best5) if winner_best5 else "unknown cardboard"
+    community = cards_text(table.community_cards)
+    winning_cards_txt = cards_text(winner_best5) if winner_best5 else "unknown cardboard"
 
     text = (
         f"🃏 *Showdown!*\n\n"
@@ -1568,61 +2051,53 @@ async def handle_showdown_and_build_text(table: Table, context: ContextTypes.DEF
         "Hit *New Hand* to keep the suffering going."
     )
 
-    next_kb = InlineKeyboardMarkup(
-        [
-            [InlineKeyboardButton("🎬 New Hand", callback_data="start_hand")],
-            [
-                InlineKeyboardButton("🏆 Leaderboard", callback_data="show_leaderboard"),
-                InlineKeyboardButton("📊 Table Stats", callback_data="show_stats"),
-            ],
-        ]
-    )
+    next_kb = _SHOWDOWN_KB
 
     # Winner video preferred, fallback to image
-    if WINNER_VIDEO_PATH.exists():
-        with open(WINNER_VIDEO_PATH, "rb") as v:
-            await context.bot.send_video(
-                chat_id=query.message.chat_id,
-                video=InputFile(v),
-                caption=(
-                    f"🏆 {winner.name} takes the pot.\n"
-                    f"{winner_desc} – {winning_cards_txt}"
-                ),
-                reply_markup=next_kb,
-                message_thread_id=table.thread_id,
-            )
-    elif WINNER_PATH.exists():
-        with open(WINNER_PATH, "rb") as f:
-            await context.bot.send_photo(
-                chat_id=query.message.chat_id,
-                photo=InputFile(f),
-                caption=(
-                    f"🏆 {winner.name} wins this one.\n"
-                    f"Hand: {winner_desc} – {winning_cards_txt}\n"
-                    "Explanation: Best hand at showdown, or everyone else chickened out."
-                ),
-                reply_markup=next_kb,
-                message_thread_id=table.thread_id,
-            )
+    if WINNER_VIDEO_BYTES is not None:
+        m = await context.bot.send_video(
+            chat_id=query.message.chat_id,
+            video=_cached_media("winner_video", WINNER_VIDEO_BYTES, "winner.mp4"),
+            caption=(
+                f"🏆 {winner.name} takes the pot.\n"
+                f"{winner_desc} – {winning_cards_txt}"
+            ),
+            reply_markup=next_kb,
+            message_thread_id=table.thread_id,
+        )
+        _remember_file_id("winner_video", m)
+    elif WINNER_BYTES is not None:
+        m = await context.bot.send_photo(
+            chat_id=query.message.chat_id,
+            photo=_cached_media("winner_image", WINNER_BYTES, "winner.png"),
+            caption=(
+                f"🏆 {winner.name} wins this one.\n"
+                f"Hand: {winner_desc} – {winning_cards_txt}\n"
+                "Explanation: Best hand at showdown, or everyone else chickened out."
+            ),
+            reply_markup=next_kb,
+            message_thread_id=table.thread_id,
+        )
+        _remember_file_id("winner_image", m)
 
     return text, next_kb
 
-async def send_card_images_to_player(chat_id: int, cards: list[str], context: ContextTypes.DEFAULT_TYPE):
+async def send_card_images_to_player(chat_id: int, cards: list[int], context: ContextTypes.DEFAULT_TYPE):
     buf = build_cards_sprite(cards, per_row=2)
     if buf:
         await context.bot.send_photo(
             chat_id=chat_id,
-            photo=InputFile(buf, filename="hand.png"),
+            photo=InputFile(buf, filename="hand.webp"),
             caption="🃏 Your hand – don't show this to the maxis.",
         )
 
-    if BACK_PATH.exists():
-        with open(BACK_PATH, "rb") as f:
-            await context.bot.send_photo(
-                chat_id=chat_id,
-                photo=InputFile(f),
-                caption="🂠 BMT card back – for everyone else.",
-            )
+    if BACK_BYTES is not None:
+        m = await context.bot.send_photo(
+            chat_id=chat_id,
+            photo=_cached_media("card_back", BACK_BYTES, "cards_back.png"),
+            caption="🂠 BMT card back – for everyone else.",
+        )
+        _remember_file_id("card_back", m)
 
 
 async def send_board_images_to_topic(
@@ -1646,17 +2121,15 @@ async def send_board_images_to_topic(
 
     msg = await context.bot.send_photo(
         chat_id=chat_id,
-        photo=InputFile(buf, filename="board.png"),
+        photo=InputFile(buf, filename="board.webp"),
         caption=caption,
         parse_mode="Markdown",
         message_thread_id=table.thread_id,
     )
 
     # Nur löschen, wenn ausdrücklich gewünscht (z.B. bei "Show Board")
-    if auto_delete and context.application:
-        context.application.create_task(
-            auto_delete_message(context, chat_id, msg.message_id, delay=25)
-        )
+    if auto_delete:
+        schedule_delete(chat_id, msg.message_id, delay=25)
 
     return msg
 
@@ -1670,17 +2143,10 @@ async def show_match_finished(query, table: Table, context: ContextTypes.DEFAULT
 
     result_text = "🎉 *Match complete!*\n\nFinal results:\n" + "\n".join(rows)
 
-    kb = InlineKeyboardMarkup(
-        [
-            [InlineKeyboardButton("⬅ Back to Menu", callback_data="back_main")],
-            [InlineKeyboardButton("🎛 Poker Session Setup", callback_data="setup_menu")],
-        ]
-    )
-
     await query.message.reply_text(
         result_text,
         parse_mode="Markdown",
-        reply_markup=kb,
+        reply_markup=_MATCH_FINISHED_KB,
     )
 
 
@@ -1727,10 +2193,16 @@ async def handle_custom_raise_input(update: Update, context: ContextTypes.DEFAUL
 
 # ============== MAIN ==============
 
+async def _post_init(app):
+    # AFK-Watcher + Delete-Reaper als Tasks im Bot-Loop starten
+    app.create_task(afk_watcher_loop(app))
+    app.create_task(delete_reaper_loop(app))
+
+
 def main():
     storage.init_db()
 
-    app = ApplicationBuilder().token(BOT_TOKEN).build()
+    app = ApplicationBuilder().token(BOT_TOKEN).post_init(_post_init).build()
 
     app.add_handler(CommandHandler("start", start))
     app.add_handler(CommandHandler("settable", settable))
@@ -1754,8 +2226,6 @@ def main():
         )
     )
 
-    # AFK-Überwachung alle 5 Sekunden
-    app.job_queue.run_repeating(afk_watcher_job, interval=5, first=5)
 
     print("BMT Poker Bot running…")
     app.run_polling()
@@ -1,7 +1,7 @@
 # storage.py
 import sqlite3
 from pathlib import Path
-from typing import List
+from typing import List, Optional
 
 DB_PATH = Path(__file__).parent / "bmt_poker.sqlite3"
 
@@ -9,10 +9,21 @@ DB_PATH = Path(__file__).parent / "bmt_poker.sqlite3"
 # --------------------------------------------
 # DB CONNECTION
 # --------------------------------------------
+# Eine geteilte Connection für den ganzen Prozess statt connect/close
+# pro Aufruf: spart File-Open + Journal-Check je Query. WAL sorgt dafür,
+# dass Leaderboard-Reads nicht hinter Writes warten müssen.
+_CONN: Optional[sqlite3.Connection] = None
+
+
 def get_conn():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect(DB_PATH, check_same_thread=False)
+        _CONN.row_factory = sqlite3.Row
+        _CONN.execute("PRAGMA journal_mode=WAL")
+        _CONN.execute("PRAGMA synchronous=NORMAL")
+        _CONN.execute("PRAGMA temp_store=MEMORY")
+    return _CONN
 
 
 # --------------------------------------------
@@ -20,45 +31,59 @@ def get_conn():
 # --------------------------------------------
 def init_db():
     conn = get_conn()
-    cur = conn.cursor()
 
-    cur.execute("""
-        CREATE TABLE IF NOT EXISTS players (
-            user_id INTEGER PRIMARY KEY,
-            name TEXT,
-            total_chips_won INTEGER DEFAULT 0,
-            hands_played INTEGER DEFAULT 0,
-            hands_won INTEGER DEFAULT 0
-        )
-    """)
-
-    conn.commit()
-    conn.close()
+    # "with conn" committed am Blockende bzw. rollt bei Exceptions
+    # zurück – kein manuelles cursor()/commit() mehr pro Writer.
+    with conn:
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS players (
+                user_id INTEGER PRIMARY KEY,
+                name TEXT,
+                total_chips_won INTEGER DEFAULT 0,
+                hands_played INTEGER DEFAULT 0,
+                hands_won INTEGER DEFAULT 0
+            )
+        """)
+
+        # Leaderboard sortiert nach Chips – mit Index liest SQLite die
+        # Top-N direkt statt die ganze Tabelle zu scannen und sortieren.
+        conn.execute("""
+            CREATE INDEX IF NOT EXISTS idx_players_chips_desc
+            ON players(total_chips_won DESC)
+        """)
 
 
 # --------------------------------------------
 # PLAYER MANAGEMENT
 # --------------------------------------------
 def ensure_player(user_id: int, name: str):
+    # Echter Upsert statt SELECT-dann-INSERT/UPDATE: ein Statement,
+    # ein Roundtrip (SQLite >= 3.24, also jedes moderne Python).
     conn = get_conn()
-    cur = conn.cursor()
-
-    cur.execute("SELECT user_id FROM players WHERE user_id = ?", (user_id,))
-    row = cur.fetchone()
-
-    if row is None:
-        cur.execute(
-            "INSERT INTO players (user_id, name) VALUES (?, ?)",
+    with conn:
+        conn.execute(
+            """
+            INSERT INTO players (user_id, name) VALUES (?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET name = excluded.name
+            """,
             (user_id, name),
         )
-    else:
-        cur.execute(
-            "UPDATE players SET name = ? WHERE user_id = ?",
-            (name, user_id),
-        )
 
-    conn.commit()
-    conn.close()
+
+def ensure_players_bulk(items: List[tuple]):
+    """
+    Wie ensure_player, aber für mehrere (user_id, name) auf einmal –
+    ein executemany + ein Commit statt einem pro Spieler.
+    """
+    conn = get_conn()
+    with conn:
+        conn.executemany(
+            """
+            INSERT INTO players (user_id, name) VALUES (?, ?)
+            ON CONFLICT(user_id) DO UPDATE SET name = excluded.name
+            """,
+            items,
+        )
 
 
 # --------------------------------------------
@@ -70,19 +95,61 @@ def record_hand_result(user_id: int, chips_delta: int, won_hand: bool):
     won_hand = True/False
     """
     conn = get_conn()
-    cur = conn.cursor()
+    with conn:
+        conn.execute("""
+            UPDATE players
+            SET
+                total_chips_won = total_chips_won + ?,
+                hands_played = hands_played + 1,
+                hands_won = hands_won + ?
+            WHERE user_id = ?
+        """, (chips_delta, 1 if won_hand else 0, user_id))
+
+
+def record_hand_results(rows: List[tuple]):
+    """
+    Wie record_hand_result, aber für alle Spieler einer Hand auf einmal.
 
-    cur.execute("""
-        UPDATE players
-        SET
-            total_chips_won = total_chips_won + ?,
-            hands_played = hands_played + 1,
-            hands_won = hands_won + ?
-        WHERE user_id = ?
-    """, (chips_delta, 1 if won_hand else 0, user_id))
+    rows = [(user_id, chips_delta, won_hand), ...]
 
-    conn.commit()
-    conn.close()
+    Eine Transaktion + ein fsync statt einem Commit pro Spieler.
+    """
+    conn = get_conn()
+    with conn:
+        conn.executemany("""
+            UPDATE players
+            SET
+                total_chips_won = total_chips_won + ?,
+                hands_played = hands_played + 1,
+                hands_won = hands_won + ?
+            WHERE user_id = ?
+        """, [(delta, 1 if won else 0, uid) for uid, delta, won in rows])
+
+
+def record_showdown(winner_id: int, pot: int, loser_ids: List[int]):
+    """
+    Gewinner + alle Verlierer einer Hand in einer Transaktion:
+    ein UPDATE für den Gewinner, ein IN-UPDATE für alle Verlierer,
+    ein Commit statt N+1.
+    """
+    conn = get_conn()
+    with conn:
+        conn.execute("""
+            UPDATE players
+            SET
+                total_chips_won = total_chips_won + ?,
+                hands_played = hands_played + 1,
+                hands_won = hands_won + 1
+            WHERE user_id = ?
+        """, (pot, winner_id))
+
+        if loser_ids:
+            placeholders = ",".join("?" * len(loser_ids))
+            conn.execute(f"""
+                UPDATE players
+                SET hands_played = hands_played + 1
+                WHERE user_id IN ({placeholders})
+            """, loser_ids)
 
 
 # --------------------------------------------
@@ -104,7 +171,6 @@ def get_leaderboard(limit: int = 20) -> List[sqlite3.Row]:
     """, (limit,))
 
     rows = cur.fetchall()
-    conn.close()
     return rows
 
 def reset_stats():
@@ -113,10 +179,8 @@ def reset_stats():
     Wird von /fullreset aufgerufen.
     """
     conn = get_conn()
-    cur = conn.cursor()
-    cur.execute("DELETE FROM players")
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("DELETE FROM players")
 
 # --------------------------------------------
 # FULL RESET OF STATS
@@ -131,15 +195,11 @@ def reset_all_stats():
     Spieler bleiben in der Tabelle erhalten, fangen aber wieder bei 0 an.
     """
     conn = get_conn()
-    cur = conn.cursor()
-
-    cur.execute("""
-        UPDATE players
-        SET
-            total_chips_won = 0,
-            hands_played = 0,
-            hands_won = 0
-    """)
-
-    conn.commit()
-    conn.close()
+    with conn:
+        conn.execute("""
+            UPDATE players
+            SET
+                total_chips_won = 0,
+                hands_played = 0,
+                hands_won = 0
+        """)